@@ -1,11 +1,15 @@
 import logging
 import os
 import shutil # Added for dummy file creation
-import time # For unique names
+import hashlib
 from typing import List, Dict, Any # Added for comprehensive type hints
 
 logger = logging.getLogger(__name__)
 
+def _content_digest(*parts: str) -> str:
+    """Stable 16-hex-char digest of the request parameters, used to name generated assets."""
+    return hashlib.blake2b("\x1f".join(parts).encode('utf-8'), digest_size=8).hexdigest()
+
 def generate_image_with_imagen(prompt: str, image_style: str = "photorealistic", aspect_ratio: str = "1:1") -> str:
     """
     Generates an image using a Text-to-Image AI model (e.g., Vertex AI Imagen).
@@ -27,12 +31,14 @@ def generate_image_with_imagen(prompt: str, image_style: str = "photorealistic",
     # generated_image_url = response.images[0].url
 
     # Placeholder for a generated image path
-    # Using time.time() and hash for more unique dummy filenames
-    timestamp = int(time.time())
-    placeholder_image_name = f"ai_generated_image_{timestamp}_{hash(prompt) % 1000}.png"
+    # Named by a stable digest of the request (builtin hash() is salted per process), so repeats reuse the file
+    placeholder_image_name = f"ai_generated_image_{_content_digest(prompt, image_style, aspect_ratio)}.png"
     temp_dir = os.path.join(os.getcwd(), "temp_ai_assets") # Using current working directory for temp_ai_assets
     os.makedirs(temp_dir, exist_ok=True)
     placeholder_image_path = os.path.join(temp_dir, placeholder_image_name)
+    if os.path.exists(placeholder_image_path):
+        logger.info(f"Reusing generated image: {placeholder_image_path}")
+        return placeholder_image_path
 
     # Create a dummy file to simulate existence
     with open(placeholder_image_path, 'w') as f:
@@ -57,11 +63,13 @@ def generate_video_with_ttv_api(script_segment: str, video_style: str = "cinemat
     logger.info(f"Simulating AI video generation with TTV API for segment: '{script_segment[:50]}...', style: '{video_style}', duration: {duration_seconds}s")
     # TODO: Integrate with a Text-to-Video API here (e.g., future Google TTV API, Hugging Face Diffusers TTV models)
 
-    timestamp = int(time.time())
-    placeholder_video_name = f"ai_generated_video_{timestamp}_{hash(script_segment) % 1000}.mp4"
+    placeholder_video_name = f"ai_generated_video_{_content_digest(script_segment, video_style, str(duration_seconds))}.mp4"
     temp_dir = os.path.join(os.getcwd(), "temp_ai_assets")
     os.makedirs(temp_dir, exist_ok=True)
     placeholder_video_path = os.path.join(temp_dir, placeholder_video_name)
+    if os.path.exists(placeholder_video_path):
+        logger.info(f"Reusing generated video: {placeholder_video_path}")
+        return placeholder_video_path
 
     # Create a dummy file to simulate existence
     with open(placeholder_video_path, 'w') as f:
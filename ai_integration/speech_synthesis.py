@@ -3,22 +3,42 @@ import os
 import uuid
 import time
 import shutil
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List, Iterator
 import requests
 import functools
-
-from google.cloud import texttospeech
-from azure.cognitiveservices.speech import SpeechSynthesizer, SpeechConfig, AudioConfig, ResultReason 
-
-from gtts import gTTS
+import hashlib
+import json
+import tempfile
+import re
+import concurrent.futures
+from xml.sax.saxutils import escape as xml_escape, unescape as xml_unescape
 
 from config import GLOBAL_CONFIG
+from utils.shell_utils import run_shell_command
+from utils.audio_utils import get_audio_duration_ffprobe
 from models import SpeechSynthesisVoice
+from new_features.cost_analyzer import cost_analyzer
 
 from new_features.advanced_tts_controls import apply_emotional_tone, adjust_speech_rate_and_pitch, insert_pauses, perform_voice_cloning
 
 logger = logging.getLogger(__name__)
 
+# The provider SDKs are slow to import and only one is used per run, so each is imported on first use
+@functools.lru_cache(maxsize=1)
+def _texttospeech():
+    from google.cloud import texttospeech
+    return texttospeech
+
+@functools.lru_cache(maxsize=1)
+def _azure_speech():
+    import azure.cognitiveservices.speech as speechsdk
+    return speechsdk
+
+@functools.lru_cache(maxsize=1)
+def _gtts_class():
+    from gtts import gTTS
+    return gTTS
+
 def retry(max_attempts: int = 3, delay_seconds: int = 2, catch_errors: Tuple[type,...] = (requests.exceptions.RequestException,)):
     def decorator(func):
         @functools.wraps(func)
@@ -52,12 +72,16 @@ def synthesize_speech_google(text: str, output_filepath: str, voice_name: str =
     Relies on GOOGLE_CLOUD_PROJECT env variable or gcloud config for project ID.
     """
     try:
+        texttospeech = _texttospeech()
         client = texttospeech.TextToSpeechClient() 
 
         if "(Google)" in voice_name:
             voice_name = voice_name.replace(" (Google)", "")
 
-        synthesis_input = texttospeech.SynthesisInput(text=text)
+        if text.startswith('<speak>'):
+            synthesis_input = texttospeech.SynthesisInput(ssml=text)
+        else:
+            synthesis_input = texttospeech.SynthesisInput(text=text)
         voice = texttospeech.VoiceSelectionParams(
             language_code="-".join(voice_name.split('-')[:2]),
             name=voice_name,
@@ -79,10 +103,54 @@ def synthesize_speech_google(text: str, output_filepath: str, voice_name: str =
         logger.error(f"Google TTS synthesis failed: {e}", exc_info=True)
         raise
 
+_AZURE_STREAM_CHUNK_BYTES = 16000 # Read size for Azure's AudioDataStream
+
+def stream_speech_azure(text: str, voice_name: str = "en-US-AvaMultilingualNeural") -> Iterator[bytes]:
+    """
+    Yields MP3 chunks from Azure Cognitive Services Speech as they are synthesized, instead of waiting
+    for the whole utterance. Raises RequestException if Azure cancels the synthesis (so @retry applies to callers).
+    """
+    speech_key = GLOBAL_CONFIG['api_keys']['azure_speech_key']
+    service_region = GLOBAL_CONFIG['api_keys']['azure_speech_region']
+
+    if "(Azure)" in voice_name:
+        voice_name = voice_name.replace(" (Azure)", "")
+
+    speechsdk = _azure_speech()
+    speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=service_region)
+    speech_config.speech_synthesis_voice_name = voice_name
+    speech_config.set_speech_synthesis_output_format(speechsdk.SpeechSynthesisOutputFormat.Audio24Khz48KBitRateMonoMp3)
+
+    # audio_config=None keeps the audio in memory; start_speaking returns once the first audio is available
+    speech_synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+    if text.startswith('<speak>'):
+        # Azure needs the full SSML envelope with the voice named inside the document
+        language = "-".join(voice_name.split('-')[:2])
+        ssml = (f"<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' xml:lang='{language}'>"
+                f"<voice name='{voice_name}'>{text[len('<speak>'):-len('</speak>')]}</voice></speak>")
+        result = speech_synthesizer.start_speaking_ssml_async(ssml).get()
+    else:
+        result = speech_synthesizer.start_speaking_text_async(text).get()
+    stream = speechsdk.AudioDataStream(result)
+
+    buffer = bytes(_AZURE_STREAM_CHUNK_BYTES)
+    filled = stream.read_data(buffer)
+    while filled > 0:
+        yield buffer[:filled]
+        filled = stream.read_data(buffer)
+
+    if stream.status == speechsdk.StreamStatus.Canceled:
+        cancellation_details = stream.cancellation_details
+        logger.error(f"Azure TTS speech synthesis canceled: {cancellation_details.reason}")
+        if cancellation_details.error_details:
+            logger.error(f"Azure TTS error details: {cancellation_details.error_details}")
+        raise requests.exceptions.RequestException(f"Azure TTS Canceled: {cancellation_details.reason}")
+
 @retry(max_attempts=3, delay_seconds=3)
 def synthesize_speech_azure(text: str, output_filepath: str, voice_name: str = "en-US-AvaMultilingualNeural") -> Optional[str]:
     """
     Synthesizes speech using Azure Cognitive Services Speech.
+    Audio is streamed to output_filepath (MP3) chunk by chunk as Azure produces it.
     """
     speech_key = GLOBAL_CONFIG['api_keys']['azure_speech_key']
     service_region = GLOBAL_CONFIG['api_keys']['azure_speech_region']
@@ -93,45 +161,224 @@ def synthesize_speech_azure(text: str, output_filepath: str, voice_name: str = "
         return None
 
     try:
-        if "(Azure)" in voice_name:
-            voice_name = voice_name.replace(" (Azure)", "")
-
-        speech_config = SpeechConfig(subscription=speech_key, region=service_region)
-        audio_config = AudioConfig(filename=output_filepath)
-
-        speech_config.speech_synthesis_voice_name = voice_name
-
-        speech_synthesizer = SpeechSynthesizer(speech_config=speech_config, audio_config=audio_config)
-        result = speech_synthesizer.speak_text_async(text).get()
-
-        if result.reason == ResultReason.SynthesizingAudioCompleted:
-            logger.info(f"Azure TTS speech synthesized to: {output_filepath}")
-            return output_filepath
-        elif result.reason == ResultReason.Canceled:
-            cancellation_details = result.cancellation_details
-            logger.error(f"Azure TTS speech synthesis canceled: {cancellation_details.reason}")
-            if cancellation_details.error_details:
-                logger.error(f"Azure TTS error details: {cancellation_details.error_details}")
-            raise requests.exceptions.RequestException(f"Azure TTS Canceled: {cancellation_details.reason}")
+        with open(output_filepath, 'wb') as out:
+            for chunk in stream_speech_azure(text, voice_name):
+                out.write(chunk)
+        logger.info(f"Azure TTS speech synthesized to: {output_filepath}")
+        return output_filepath
     except Exception as e:
         logger.error(f"Azure TTS synthesis failed: {e}", exc_info=True)
         raise
 
+_GTTS_PART_WORKERS = 8 # Concurrent translate_tts requests per gTTS call
+
+def _gtts_parts(text: str) -> List[str]:
+    """
+    Splits text into the parts gTTS would request one by one, using its public pre-processors and tokenizer
+    cases (the gTTS defaults). Parts over gTTS's per-request limit are split again by gTTS itself.
+    """
+    from gtts.tokenizer import Tokenizer, pre_processors, tokenizer_cases
+    for pre_processor in (pre_processors.tone_marks, pre_processors.end_of_line, pre_processors.abbreviations, pre_processors.word_sub):
+        text = pre_processor(text)
+    tokenizer = Tokenizer([tokenizer_cases.tone_marks, tokenizer_cases.period_comma, tokenizer_cases.colon, tokenizer_cases.other_punctuation])
+    # Punctuation-only tokens carry nothing to speak (gTTS drops them too)
+    return [token.strip() for token in tokenizer.run(text) if any(c.isalnum() for c in token)]
+
 @retry(max_attempts=3, delay_seconds=2)
 def synthesize_speech_gtts(text: str, output_filepath: str, lang: str = 'en') -> Optional[str]:
     """
     Synthesizes speech using gTTS (Google Text-to-Speech unofficial API).
+    gTTS has no SSML support, so any markup is stripped first.
     """
     logger.info(f"Using gTTS for speech synthesis (lang={lang})...")
+    if '<' in text:
+        text = _strip_ssml(text)
     try:
-        tts = gTTS(text=text, lang=lang, slow=False)
-        tts.save(output_filepath)
-        logger.info(f"gTTS audio content written to file: {output_filepath}")
+        gTTS = _gtts_class()
+        # gTTS.save() fetches its ~100-character parts one request at a time; fetch them concurrently instead
+        # and write the MP3 frames in order (the parts are plain MP3 streams that gTTS itself just appends)
+        parts = _gtts_parts(text)
+        if len(parts) <= 1:
+            gTTS(text=text, lang=lang, slow=False).save(output_filepath)
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(_GTTS_PART_WORKERS, len(parts)), thread_name_prefix='gtts') as executor:
+                audio_parts = list(executor.map(lambda part: b''.join(gTTS(text=part, lang=lang, slow=False).stream()), parts))
+            with open(output_filepath, 'wb') as f:
+                f.write(b''.join(audio_parts))
+        logger.info(f"gTTS audio content written to file: {output_filepath} ({len(parts)} parts)")
         return output_filepath
     except Exception as e:
         logger.error(f"gTTS synthesis failed: {e}", exc_info=True)
         raise
 
+_TTS_CONCURRENCY = 3 # Sentence groups synthesized at once; TTS APIs throttle bursts beyond a few requests
+_MIN_SEGMENT_CHARS = 200 # Short sentences are grouped so each request carries a useful amount of text
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+def _split_narration_segments(text: str) -> List[str]:
+    """Splits text at sentence ends and groups consecutive sentences into segments of at least _MIN_SEGMENT_CHARS."""
+    segments: List[str] = []
+    current = ''
+    for sentence in _SENTENCE_END_RE.split(text.strip()):
+        current = f"{current} {sentence}" if current else sentence
+        if len(current) >= _MIN_SEGMENT_CHARS:
+            segments.append(current)
+            current = ''
+    if current:
+        segments.append(current)
+    return segments
+
+_SSML_CHAR_LIMITS = {'google': 5000, 'azure': 10000} # Per-request SSML size limits of the providers
+_SSML_SENTENCE_BREAK_MS = 200
+# The markup advanced_tts_controls adds (breaks, prosody, emotion wrappers); any other '<' or '>' is narration text
+_SSML_TAG_RE = re.compile(r'(</?(?:break|prosody|voice_emotion_tag)\b[^<>]*>)')
+_ANY_TAG_RE = re.compile(r'<[^<>]*>')
+
+def _strip_ssml(text: str) -> str:
+    """
+    Removes the SSML tags, leaving the spoken text. A <speak> document from _ssml_segments has all of its text
+    escaped, so there every tag is removed and the entities decoded afterwards.
+    """
+    if text.lstrip().startswith('<speak'):
+        text = xml_unescape(_ANY_TAG_RE.sub(' ', text))
+    else:
+        text = _SSML_TAG_RE.sub(' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def _pack_ssml(sentences: List[str], limit: int, break_ms: int = _SSML_SENTENCE_BREAK_MS) -> Iterator[str]:
+    """
+    Packs consecutive sentences (already SSML-safe) into as few <speak> documents as fit within limit characters,
+    each sentence in an <s> element with an optional <break> between them.
+    """
+    separator = f"<break time='{break_ms}ms'/>" if break_ms > 0 else ''
+    body = ''
+    for sentence in sentences:
+        element = f"<s>{sentence}</s>"
+        candidate = f"{body}{separator}{element}" if body else element
+        if body and len(candidate) + len('<speak></speak>') > limit:
+            yield f"<speak>{body}</speak>"
+            candidate = element
+        body = candidate
+    if body:
+        yield f"<speak>{body}</speak>"
+
+def _ssml_segments(text: str, limit: int) -> List[str]:
+    """
+    Turns narration text into SSML request bodies for Google/Azure. The text between the known tags is always
+    escaped. Plain text is packed sentence by sentence; text carrying <break> tags from insert_pauses is packed
+    without extra breaks; text with wrapping elements (prosody, emotion tags) cannot be split across <s> elements
+    and is sent as one document.
+    """
+    pieces = _SSML_TAG_RE.split(text.strip()) # Text and tags alternate, starting and ending with text
+    tags = pieces[1::2]
+    escaped = ''.join(piece if i % 2 else xml_escape(piece) for i, piece in enumerate(pieces))
+    if any(not tag.startswith('<break') for tag in tags):
+        return [f"<speak>{escaped}</speak>"]
+    sentences = [s for s in _SENTENCE_END_RE.split(escaped) if s]
+    return list(_pack_ssml(sentences, limit, break_ms=_SSML_SENTENCE_BREAK_MS if not tags else 0))
+
+def _ssml_provider(voice_type: SpeechSynthesisVoice) -> Optional[str]:
+    """Returns the _SSML_CHAR_LIMITS key for voices whose backend accepts SSML, else None."""
+    if voice_type == SpeechSynthesisVoice.GTTS_DEFAULT:
+        return None
+    if "Google" in voice_type.value:
+        return 'google'
+    if "Azure" in voice_type.value:
+        return 'azure'
+    return None
+
+def _synthesize_fragments(segments: List[str], fragment_paths: List[str], voice_type: SpeechSynthesisVoice) -> Optional[List[str]]:
+    """
+    Synthesizes segments into fragment_paths concurrently (at most _TTS_CONCURRENCY in flight).
+    Returns the service that produced each fragment, or None if any segment failed.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_TTS_CONCURRENCY, thread_name_prefix='tts') as executor:
+        services = list(executor.map(_synthesize_with_voice, segments, fragment_paths, [voice_type] * len(segments)))
+    if not all(services):
+        logger.error("One or more narration segments failed to synthesize.")
+        return None
+    return services
+
+def _mp3_frames(path: str) -> Optional[Tuple[bytes, Tuple[int, int, int]]]:
+    """
+    Returns the MPEG audio frames of an MP3 file with its ID3v2 header and ID3v1 trailer removed, plus the
+    (version, sample-rate index, channel mode) of the first frame; None if the data doesn't start on a frame sync.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:3] == b'ID3' and len(data) >= 10:
+        tag_size = (data[6] & 0x7f) << 21 | (data[7] & 0x7f) << 14 | (data[8] & 0x7f) << 7 | (data[9] & 0x7f) # Synchsafe
+        footer_size = 10 if data[5] & 0x10 else 0
+        data = data[10 + tag_size + footer_size:]
+    if data[-128:-125] == b'TAG':
+        data = data[:-128]
+    if len(data) < 4 or data[0] != 0xFF or data[1] & 0xE0 != 0xE0:
+        return None
+    return data, ((data[1] >> 3) & 0x3, (data[2] >> 2) & 0x3, data[3] >> 6)
+
+def _concat_mp3_fragments(paths: List[str], output_path: str) -> bool:
+    """
+    Joins MP3 files by appending their raw frame streams, which is valid when all share one MPEG format
+    (same provider and voice). Returns False without writing if any file is not a bare MP3 or the formats differ.
+    """
+    fragments = [_mp3_frames(path) for path in paths]
+    if any(fragment is None for fragment in fragments) or len({fmt for _, fmt in fragments}) != 1:
+        return False
+    with open(output_path, 'wb') as out:
+        for data, _ in fragments:
+            out.write(data)
+    return True
+
+def _concat_audio_files(paths: List[str], output_path: str, gap_ms: int = 0) -> Optional[str]:
+    """
+    Joins audio files in order. Without gaps, MP3s sharing one format are concatenated frame-wise in Python and
+    anything else is stream-copied by ffmpeg's concat demuxer (list fed on stdin); with gap_ms > 0 every file
+    but the last is padded with that much silence and the result re-encoded.
+    """
+    if gap_ms <= 0 and all(path.lower().endswith('.mp3') for path in (*paths, output_path)):
+        if _concat_mp3_fragments(paths, output_path):
+            return output_path
+        logger.info("Narration fragments differ in MP3 format; joining them with ffmpeg instead.")
+    if gap_ms <= 0:
+        # file: keeps ffmpeg from resolving the entries against the list's own pipe: URL
+        concat_list = ''.join(f"file 'file:{os.path.abspath(path)}'\n" for path in paths)
+        cmd = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-protocol_whitelist', 'file,pipe', '-i', 'pipe:0', '-c', 'copy', output_path]
+        stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=120, input_text=concat_list)
+    else:
+        input_args = [arg for path in paths for arg in ('-i', path)]
+        pads = ';'.join(f"[{i}:a]apad=pad_dur={gap_ms / 1000:.3f}[a{i}]" for i in range(len(paths) - 1))
+        labels = ''.join(f"[a{i}]" for i in range(len(paths) - 1)) + f"[{len(paths) - 1}:a]"
+        filter_complex = f"{pads};{labels}concat=n={len(paths)}:v=0:a=1[aout]" if pads else f"{labels}anull[aout]"
+        cmd = ['ffmpeg', '-y', *input_args, '-filter_complex', filter_complex, '-map', '[aout]', '-c:a', 'libmp3lame', '-q:a', '4', output_path]
+        stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=300)
+    if returncode != 0:
+        logger.error(f"Failed to join {len(paths)} narration segments: {stderr}")
+        return None
+    return output_path
+
+def _synthesize_segments_parallel(segments: List[str], audio_filepath: str, voice_type: SpeechSynthesisVoice) -> Optional[List[str]]:
+    """
+    Synthesizes segments concurrently into numbered fragment files, then joins them in order,
+    so total time is close to the slowest batch of segments rather than the sum of all of them.
+    Returns the service that produced each segment, or None on failure.
+    """
+    base, ext = os.path.splitext(audio_filepath)
+    fragment_paths = [f"{base}_part{i:03d}{ext}" for i in range(len(segments))]
+    try:
+        services = _synthesize_fragments(segments, fragment_paths, voice_type)
+        if not services:
+            return None
+        if not _concat_audio_files(fragment_paths, audio_filepath):
+            return None
+        logger.info(f"Narration synthesized from {len(segments)} parallel segments to: {audio_filepath}")
+        return services
+    finally:
+        for path in fragment_paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
 def synthesize_narration(
     text: str,
     audio_output_dir: str,
@@ -148,8 +395,6 @@ def synthesize_narration(
     Prioritizes gTTS if selected, otherwise attempts Google/Azure.
     """
     os.makedirs(audio_output_dir, exist_ok=True)
-    audio_filename = f"narration_{uuid.uuid4().hex}.mp3"
-    audio_filepath = os.path.join(audio_output_dir, audio_filename)
 
     processed_text = text
     if emotional_tone:
@@ -159,33 +404,198 @@ def synthesize_narration(
     if insert_pause_ms:
         processed_text = insert_pauses(processed_text, insert_pause_ms)
 
+    # Content-addressed output: the tone/rate/pause controls are already baked into processed_text,
+    # so the same voice and processed text always map to the same file and repeats skip the TTS call
+    cache_key = hashlib.sha256("\x1f".join((voice_type.value, voice_clone_audio_path or '', processed_text)).encode('utf-8')).hexdigest()
+    audio_filepath = os.path.join(audio_output_dir, f"narration_{cache_key}.mp3")
+    if os.path.isfile(audio_filepath) and os.path.getsize(audio_filepath) > 0:
+        logger.info(f"Reusing cached narration audio: {audio_filepath}")
+        return audio_filepath
+
+    # Synthesize under a temporary name and move into place only on success, so a failed run never leaves a cache entry
+    partial_filepath = os.path.join(audio_output_dir, f"narration_{cache_key}.{uuid.uuid4().hex}.mp3")
+    try:
+        usage = _synthesize_uncached(processed_text, partial_filepath, voice_type, voice_clone_audio_path)
+        if not usage:
+            return None
+        os.replace(partial_filepath, audio_filepath)
+    finally:
+        if os.path.exists(partial_filepath):
+            os.remove(partial_filepath)
+    _record_tts_usage(usage)
+    return audio_filepath
+
+def _lower_thread_priority() -> None:
+    """Executor initializer: on Linux os.nice only affects the calling thread, so prewarm workers yield the CPU."""
+    if hasattr(os, 'nice'):
+        try:
+            os.nice(10)
+        except OSError:
+            pass
+
+_PREWARM_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts-prewarm', initializer=_lower_thread_priority)
+
+def speculative_prewarm(
+    texts: List[str],
+    voice_type: SpeechSynthesisVoice,
+    audio_output_dir: str
+) -> List[concurrent.futures.Future]:
+    """
+    Synthesizes predictable narration (intros, stingers) in the background with synthesize_narration into
+    audio_output_dir. Returns one future per unique text, resolving to its audio path (None on failure);
+    wait on them before using the audio or deleting audio_output_dir.
+    """
+    def prewarm(text: str) -> Optional[str]:
+        try:
+            return synthesize_narration(text, audio_output_dir, voice_type)
+        except Exception as e:
+            logger.warning(f"Speculative TTS for '{text[:40]}' failed: {e}")
+            return None
+
+    unique_texts = [text for text in dict.fromkeys(texts) if text and text.strip()]
+    if unique_texts:
+        logger.info(f"Pre-synthesizing {len(unique_texts)} predictable narration snippet(s) in the background.")
+    return [_PREWARM_EXECUTOR.submit(prewarm, text) for text in unique_texts]
+
+def prepend_intro_audio(intro_paths: List[str], narration_path: str) -> Optional[str]:
+    """
+    Joins intro snippets (e.g. the results of speculative_prewarm) in front of narration_path.
+    The combined file is written next to the narration; returns its path, or None if the join failed.
+    """
+    base, ext = os.path.splitext(narration_path)
+    intro_key = hashlib.sha256("\x1f".join(intro_paths).encode('utf-8')).hexdigest()[:16]
+    return _concat_audio_files([*intro_paths, narration_path], f"{base}_intro_{intro_key}{ext}")
+
+def _record_tts_usage(usage: List[Tuple[str, str]]) -> None:
+    """Records a completed (non-cached) synthesis with the cost analyzer, per (service, text) that produced audio."""
+    for service, text in usage:
+        if service in ('google_tts', 'azure_tts'):
+            cost_analyzer.record_usage(service, 'characters', len(text))
+        else: # gTTS and voice cloning are counted per request
+            cost_analyzer.record_usage(service, 'requests', 1)
+
+def _synthesize_uncached(
+    processed_text: str,
+    audio_filepath: str,
+    voice_type: SpeechSynthesisVoice,
+    voice_clone_audio_path: Optional[str]
+) -> Optional[List[Tuple[str, str]]]:
+    """
+    Runs voice cloning or the TTS backends for processed_text, writing audio_filepath.
+    Returns (service, text) for each request that actually produced the audio, or None on failure.
+    """
     if voice_clone_audio_path and os.path.exists(voice_clone_audio_path):
         logger.info(f"Attempting voice cloning using {voice_clone_audio_path} for narration.")
         cloned_audio = perform_voice_cloning(voice_clone_audio_path, processed_text)
         if cloned_audio:
             shutil.copy(cloned_audio, audio_filepath)
             logger.info(f"Narration synthesized via voice cloning to: {audio_filepath}")
-            return audio_filepath
+            return [('voice_cloning', processed_text)]
         else:
             logger.warning("Voice cloning failed, falling back to standard synthesis.")
 
+    # Google/Azure take SSML, so sentences are batched into as few requests as their size limits allow;
+    # gTTS gets plain sentence groups synthesized in parallel
+    provider = _ssml_provider(voice_type)
+    if provider:
+        segments = _ssml_segments(processed_text, _SSML_CHAR_LIMITS[provider])
+    else:
+        segments = _split_narration_segments(_strip_ssml(processed_text))
+    if len(segments) <= 1:
+        text = segments[0] if segments else processed_text
+        service = _synthesize_with_voice(text, audio_filepath, voice_type)
+        return [(service, text)] if service else None
+    services = _synthesize_segments_parallel(segments, audio_filepath, voice_type)
+    return list(zip(services, segments)) if services else None
+
+def _synthesize_with_voice(text: str, audio_filepath: str, voice_type: SpeechSynthesisVoice) -> Optional[str]:
+    """
+    Runs the TTS backend for voice_type on text, falling back to gTTS if Google/Azure fail.
+    Returns the cost-analyzer service that wrote audio_filepath ('google_tts', 'azure_tts' or 'gtts'), or None.
+    """
     # --- FIX: Prioritize gTTS if selected ---
     if voice_type == SpeechSynthesisVoice.GTTS_DEFAULT:
-        return synthesize_speech_gtts(processed_text, audio_filepath)
+        return 'gtts' if synthesize_speech_gtts(text, audio_filepath) else None
     elif "Google" in voice_type.value:
         try:
             google_voice_name = voice_type.value.replace(" (Google)", "")
-            return synthesize_speech_google(processed_text, audio_filepath, google_voice_name)
+            return 'google_tts' if synthesize_speech_google(text, audio_filepath, google_voice_name) else None
         except Exception as e:
             logger.error(f"Google TTS failed, falling back to gTTS: {e}", exc_info=True)
-            return synthesize_speech_gtts(processed_text, audio_filepath) # Fallback
+            return 'gtts' if synthesize_speech_gtts(text, audio_filepath) else None # Fallback
     elif "Azure" in voice_type.value:
         try:
             azure_voice_name = voice_type.value.replace(" (Azure)", "")
-            return synthesize_speech_azure(processed_text, audio_filepath, azure_voice_name)
+            return 'azure_tts' if synthesize_speech_azure(text, audio_filepath, azure_voice_name) else None
         except Exception as e:
             logger.error(f"Azure TTS failed, falling back to gTTS: {e}", exc_info=True)
-            return synthesize_speech_gtts(processed_text, audio_filepath) # Fallback
+            return 'gtts' if synthesize_speech_gtts(text, audio_filepath) else None # Fallback
     else:
         logger.error(f"Unsupported speech synthesis voice type: {voice_type}. Falling back to gTTS.")
-        return synthesize_speech_gtts(processed_text, audio_filepath)
+        return 'gtts' if synthesize_speech_gtts(text, audio_filepath) else None
+
+_TTS_SEGMENT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'einstein-tts-cache') # Survives runtime-dir cleanup
+_MANIFEST_NAME = 'manifest.json'
+
+def synthesize_narration_cached(
+    text: str,
+    audio_output_dir: str,
+    voice_type: SpeechSynthesisVoice,
+    cache_dir: str = _TTS_SEGMENT_CACHE_DIR,
+    gap_ms: int = 0
+) -> Optional[str]:
+    """
+    Two-phase narration: per-segment audio is kept under cache_dir/<sha256 of voice and text>/NNN.mp3 with a
+    manifest.json, so a re-run with the same script only reassembles the cached segments (e.g. with a new gap_ms)
+    instead of calling the TTS backend again. A missing or mismatched manifest re-synthesizes that entry from scratch.
+    """
+    normalized_text = ' '.join(text.split())
+    source_sha = hashlib.sha256(f"{voice_type.value}\x1f{normalized_text}".encode('utf-8')).hexdigest()
+    entry_dir = os.path.join(cache_dir, source_sha)
+    manifest = _load_manifest(entry_dir)
+
+    if manifest is None or manifest.get('sha') != source_sha:
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.makedirs(entry_dir, exist_ok=True)
+        segments = _split_narration_segments(normalized_text)
+        fragment_paths = [os.path.join(entry_dir, f"{i:03d}.mp3") for i in range(len(segments))]
+        if not _synthesize_fragments(segments, fragment_paths, voice_type):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+        manifest = {
+            'sha': source_sha,
+            'voice': voice_type.value,
+            'segments': [
+                {'text': segment, 'file': os.path.basename(path), 'dur': get_audio_duration_ffprobe(path)}
+                for segment, path in zip(segments, fragment_paths)
+            ]
+        }
+        # Written last, so an interrupted synthesis never looks like a complete entry
+        with open(os.path.join(entry_dir, _MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f)
+        logger.info(f"Synthesized and cached {len(segments)} narration segments in {entry_dir}")
+    else:
+        logger.info(f"Reusing {len(manifest['segments'])} cached narration segments from {entry_dir}")
+
+    os.makedirs(audio_output_dir, exist_ok=True)
+    output_path = os.path.join(audio_output_dir, f"narration_{source_sha[:16]}_{gap_ms}ms.mp3")
+    return reassemble_narration(entry_dir, output_path, gap_ms)
+
+def reassemble_narration(entry_dir: str, output_path: str, gap_ms: int = 0) -> Optional[str]:
+    """Joins the cached segments listed in entry_dir's manifest into output_path, with gap_ms of silence between them."""
+    manifest = _load_manifest(entry_dir)
+    if manifest is None:
+        logger.error(f"No complete narration cache entry in {entry_dir}")
+        return None
+    return _concat_audio_files([os.path.join(entry_dir, segment['file']) for segment in manifest['segments']], output_path, gap_ms)
+
+def _load_manifest(entry_dir: str) -> Optional[dict]:
+    """Returns the entry's manifest if it exists and every segment file it lists is present, else None."""
+    try:
+        with open(os.path.join(entry_dir, _MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not all(os.path.isfile(os.path.join(entry_dir, segment['file'])) for segment in manifest.get('segments', [])):
+        return None
+    return manifest
@@ -60,7 +60,8 @@ GLOBAL_CONFIG = {
     'audio_settings': {
         'default_narration_voice': 'gTTS (Basic)', # Set to gTTS as basic reliable fallback
         'default_background_music_query': 'upbeat cinematic',
-        'default_background_music_volume': -15
+        'default_background_music_volume': -15,
+        'speculative_texts': [] # Intro lines narrated before the script, pre-synthesized in the background at pipeline start
     },
 
     'subtitle_settings': {
@@ -80,6 +81,9 @@ GLOBAL_CONFIG = {
     },
     'api_timeouts': {
         'speech_to_text_timeout_s': 300
+    },
+    'cache_settings': {
+        'stock_search_ttl_s': 24 * 3600 # Pexels/Pixabay catalogs change slowly
     }
 }
 
@@ -90,8 +94,9 @@ def setup_runtime_directories():
     """ # <<< FIX: Ensure this triple quote is correctly closed
     _logger = logging.getLogger(__name__)
     base_dir = GLOBAL_CONFIG['paths']['base_dir']
-    for key, path in GLOBAL_CONFIG['paths'].items():
-        if key.endswith('_dir'):
-            full_path = os.path.join(base_dir if key != 'base_dir' else '', path)
-            os.makedirs(full_path, exist_ok=True)
-            _logger.info(f"Ensured runtime directory: {full_path}")
\ No newline at end of file
+    # Creating each leaf also creates base_dir, so base_dir itself needs no separate makedirs
+    leaf_dirs = [os.path.join(base_dir, path) for key, path in GLOBAL_CONFIG['paths'].items()
+                 if key.endswith('_dir') and key != 'base_dir']
+    for leaf_dir in leaf_dirs or [base_dir]:
+        os.makedirs(leaf_dir, exist_ok=True)
+    _logger.info(f"Ensured runtime directories under {base_dir}: {leaf_dirs}")
\ No newline at end of file
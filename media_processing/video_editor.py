@@ -2,9 +2,8 @@
 import os
 import logging
 import random
-import shlex
 import shutil
-import time
+import concurrent.futures
 from typing import List, Optional, Tuple, Any
 
 # Import MoviePy components
@@ -12,13 +11,30 @@ from moviepy.editor import VideoFileClip, ImageClip, concatenate_videoclips, Tex
 from moviepy.video.fx import all as vfx # To make sure resize is accessible via vfx.resize
 
 from utils.ffmpeg_utils import add_audio_to_video, add_subtitles_to_video, escape_ffmpeg_text
-from utils.video_utils import get_video_duration, search_pexels_videos, search_pixabay_videos, download_video_clip, get_video_resolution
+from utils.video_utils import get_video_duration, search_stock_videos, download_video_clip, get_video_resolution
 from ai_integration.image_video_generation import generate_image_with_imagen, generate_video_with_ttv_api, combine_ai_visuals_with_stock_footage
 from config import GLOBAL_CONFIG
 from models import VideoTransitionMode, VideoSourceType, VideoAspect, VideoConcatMode, SubtitleEntry, SubtitleFont, SubtitlePosition
 
 logger = logging.getLogger(__name__)
 
+def _ass_timestamp(seconds: float) -> str:
+    """Formats seconds as an ASS H:MM:SS.cc timestamp (same output as the former strftime/gmtime form, without the struct_time)."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours % 24:02d}:{minutes:02d}:{secs:02d}.{int((seconds % 1) * 100):02d}"
+
+_ASS_HEADER_TEMPLATE = """[Script Info]
+ScriptType: v4.00+
+Collisions: Normal
+PlayResX: 1920
+PlayResY: 1080
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,{font},{font_size},{color},{color},{outline_color},{outline_color},0,0,0,0,100,100,0,0,1,{outline_width},0,{alignment},0,0,0,1
+"""
+
 def generate_subtitles_file(
     subtitle_entries: List[SubtitleEntry],
     output_filepath: str,
@@ -35,21 +51,15 @@ def generate_subtitles_file(
     """
     logger.info(f"Generating ASS subtitle file: {output_filepath}")
 
-    ass_content = f"""[Script Info]
-ScriptType: v4.00+
-Collisions: Normal
-PlayResX: 1920
-PlayResY: 1080
-
-[V4+ Styles]
-Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-Style: Default,{font.value},{font_size},{color},{color},{outline_color},{outline_color},0,0,0,0,100,100,0,0,1,{outline_width},0,{position.to_ffmpeg_ass_position()},0,0,0,1
-"""
-    for entry in subtitle_entries:
-        start_time = time.strftime('%H:%M:%S', time.gmtime(entry.start_time_s)) + f".{int((entry.start_time_s % 1) * 100):02d}"
-        end_time = time.strftime('%H:%M:%S', time.gmtime(entry.end_time_s)) + f".{int((entry.end_time_s % 1) * 100):02d}"
-        safe_text = escape_ffmpeg_text(entry.text)
-        ass_content += f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{safe_text}\n"
+    header = _ASS_HEADER_TEMPLATE.format(
+        font=font.value, font_size=font_size, color=color, outline_color=outline_color,
+        outline_width=outline_width, alignment=position.to_ffmpeg_ass_position()
+    )
+    # Collect the lines and join once instead of growing one string per entry
+    ass_content = header + ''.join(
+        f"Dialogue: 0,{_ass_timestamp(entry.start_time_s)},{_ass_timestamp(entry.end_time_s)},Default,,0,0,0,,{escape_ffmpeg_text(entry.text)}\n"
+        for entry in subtitle_entries
+    )
 
     try:
         with open(output_filepath, 'w', encoding='utf-8') as f:
@@ -60,6 +70,30 @@ Style: Default,{font.value},{font_size},{color},{color},{outline_color},{outline
         logger.error(f"Failed to write subtitle file: {e}", exc_info=True)
         return None
 
+_MAX_PARALLEL_DOWNLOADS = 8 # Clip downloads in flight at once; the shared HTTP session pools 32 connections
+
+def _download_clips_concurrently(candidates: List[Tuple[str, str]], wanted: int) -> List[str]:
+    """
+    Downloads clips from (url, output path) candidates until `wanted` succeed, running each wave of downloads
+    concurrently. Failed downloads are replaced by the next candidates; results keep candidate order.
+    """
+    downloaded: List[str] = []
+    next_index = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(_MAX_PARALLEL_DOWNLOADS, max(wanted, 1))) as executor:
+        while len(downloaded) < wanted and next_index < len(candidates):
+            wave = candidates[next_index:next_index + wanted - len(downloaded)]
+            next_index += len(wave)
+            futures = [executor.submit(download_video_clip, url, path) for url, path in wave]
+            for (url, path), future in zip(wave, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Download of {url} failed: {e}")
+                    result = None
+                if result:
+                    downloaded.append(result)
+    return downloaded
+
 def download_source_clips(video_params: Any, video_downloads_dir: str, max_clip_duration_s: int) -> List[str]:
     """
     Downloads video clips based on the selected source type.
@@ -81,15 +115,23 @@ def download_source_clips(video_params: Any, video_downloads_dir: str, max_clip_
 
     os.makedirs(video_downloads_dir, exist_ok=True)
 
-    if video_params.video_source_type in [VideoSourceType.STOCK_FOOTAGE_PEXELS_PIXABAY, VideoSourceType.STOCK_FOOTAGE_PEXELS_ONLY]:
-        logger.info(f"Sourcing videos from Pexels for query: {video_params.video_subject}")
-        pexels_api_key = GLOBAL_CONFIG['api_keys']['pexels_api_key']
-        pexels_videos = search_pexels_videos(
+    use_pexels = video_params.video_source_type in [VideoSourceType.STOCK_FOOTAGE_PEXELS_PIXABAY, VideoSourceType.STOCK_FOOTAGE_PEXELS_ONLY]
+    use_pixabay = video_params.video_source_type in [VideoSourceType.STOCK_FOOTAGE_PEXELS_PIXABAY, VideoSourceType.STOCK_FOOTAGE_PIXABAY_ONLY]
+    if use_pexels or use_pixabay:
+        # Both providers are queried concurrently up front
+        stock_results = search_stock_videos(
             query=video_params.video_subject,
-            api_key=pexels_api_key,
+            pexels_api_key=GLOBAL_CONFIG['api_keys']['pexels_api_key'] if use_pexels else None,
+            pixabay_api_key=GLOBAL_CONFIG['api_keys']['pixabay_api_key'] if use_pixabay else None,
             orientation='portrait' if video_params.video_aspect_ratio == VideoAspect.PORTRAIT_9_16 else 'landscape',
             per_page=video_params.num_videos_to_source_or_generate
         )
+
+    # (url, output path) candidates in preference order: Pexels results first, then Pixabay
+    stock_candidates: List[Tuple[str, str]] = []
+    if use_pexels:
+        logger.info(f"Sourcing videos from Pexels for query: {video_params.video_subject}")
+        pexels_videos = stock_results['pexels']
         for i, video_data in enumerate(pexels_videos):
             best_video_url = None
             for v_file in video_data.get('video_files', []):
@@ -101,37 +143,26 @@ def download_source_clips(video_params: Any, video_downloads_dir: str, max_clip_
                     break
             
             if best_video_url:
-                output_filepath = os.path.join(video_downloads_dir, f"pexels_clip_{i}.mp4")
-                downloaded_path = download_video_clip(best_video_url, output_filepath)
-                if downloaded_path:
-                    downloaded_clip_paths.append(downloaded_path)
-                    if len(downloaded_clip_paths) >= video_params.num_videos_to_source_or_generate:
-                        break
+                stock_candidates.append((best_video_url, os.path.join(video_downloads_dir, f"pexels_clip_{i}.mp4")))
             else:
                 logger.warning(f"No suitable Pexels video link found for clip {i} for query '{video_params.video_subject}'")
 
-    if video_params.video_source_type in [VideoSourceType.STOCK_FOOTAGE_PEXELS_PIXABAY, VideoSourceType.STOCK_FOOTAGE_PIXABAY_ONLY]:
+    if use_pixabay:
         logger.info(f"Sourcing videos from Pixabay for query: {video_params.video_subject}")
-        pixabay_api_key = GLOBAL_CONFIG['api_keys']['pixabay_api_key']
-        pixabay_videos = search_pixabay_videos(
-            query=video_params.video_subject,
-            api_key=pixabay_api_key,
-            per_page=video_params.num_videos_to_source_or_generate
-        )
+        pixabay_videos = stock_results['pixabay']
         for i, video_data in enumerate(pixabay_videos):
             video_url = video_data.get('videos', {}).get('medium', {}).get('url')
             if video_url:
-                output_filepath = os.path.join(video_downloads_dir, f"pixabay_clip_{i}.mp4")
-                downloaded_path = download_video_clip(video_url, output_filepath)
-                if downloaded_path:
-                    downloaded_clip_paths.append(downloaded_path)
-                    if len(downloaded_clip_paths) >= video_params.num_videos_to_source_or_generate:
-                        break
+                stock_candidates.append((video_url, os.path.join(video_downloads_dir, f"pixabay_clip_{i}.mp4")))
             else:
                 logger.warning(f"No suitable Pixabay video link found for clip {i} for query '{video_params.video_subject}'")
 
+    if stock_candidates:
+        downloaded_clip_paths.extend(_download_clips_concurrently(stock_candidates, video_params.num_videos_to_source_or_generate))
+
     if video_params.video_source_type == VideoSourceType.AI_GENERATED_IMAGES:
         logger.info(f"Generating AI images for video: {video_params.video_subject}")
+        image_clip_paths = {} # image_path -> encoded clip; identical prompts yield the same image, encode it once
         for i in range(video_params.num_videos_to_source_or_generate):
             prompt = video_params.video_subject
             if video_params.image_prompt_suffix:
@@ -144,13 +175,18 @@ def download_source_clips(video_params: Any, video_downloads_dir: str, max_clip_
                 image_style="photorealistic",
                 aspect_ratio=img_aspect_ratio
             )
-            if image_path:
+            if image_path in image_clip_paths:
+                downloaded_clip_paths.append(image_clip_paths[image_path])
+            elif image_path:
                 image_video_path = os.path.join(video_downloads_dir, f"ai_image_clip_{i}.mp4")
                 
                 try:
                     clip = ImageClip(image_path, fps=24).set_duration(max_clip_duration_s) 
                     clip = clip.resize(newsize=(target_width, target_height))
-                    clip.write_videofile(image_video_path, codec="libx264", fps=24, preset="fast", audio_codec=None)
+                    # A still frame has no motion to search for, so the fastest preset tuned for stills loses almost nothing
+                    clip.write_videofile(image_video_path, codec="libx264", fps=24, preset="ultrafast", audio_codec=None,
+                                         threads=os.cpu_count(), ffmpeg_params=['-tune', 'stillimage', '-crf', '23'])
+                    image_clip_paths[image_path] = image_video_path
                     downloaded_clip_paths.append(image_video_path)
                 except Exception as e:
                     logger.error(f"Failed to convert AI image {image_path} to video using MoviePy: {e}", exc_info=True)
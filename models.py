@@ -84,16 +84,20 @@ class SubtitlePosition(str, Enum):
 
     def to_ffmpeg_ass_position(self) -> int:
         """Maps enum to ASS position number for FFmpeg subtitles filter."""
-        if self == SubtitlePosition.BOTTOM_LEFT: return 1
-        if self == SubtitlePosition.BOTTOM_CENTER: return 2
-        if self == SubtitlePosition.BOTTOM_RIGHT: return 3
-        if self == SubtitlePosition.MIDDLE_LEFT: return 4
-        if self == SubtitlePosition.MIDDLE_CENTER: return 5
-        if self == SubtitlePosition.MIDDLE_RIGHT: return 6
-        if self == SubtitlePosition.TOP_LEFT: return 7
-        if self == SubtitlePosition.TOP_CENTER: return 8
-        if self == SubtitlePosition.TOP_RIGHT: return 9
-        return 2 # Default to bottom center
+        return _ASS_POSITIONS.get(self, 2) # Default to bottom center
+
+# ASS numpad-style alignment for each SubtitlePosition, built once instead of an if-chain per call
+_ASS_POSITIONS = {
+    SubtitlePosition.BOTTOM_LEFT: 1,
+    SubtitlePosition.BOTTOM_CENTER: 2,
+    SubtitlePosition.BOTTOM_RIGHT: 3,
+    SubtitlePosition.MIDDLE_LEFT: 4,
+    SubtitlePosition.MIDDLE_CENTER: 5,
+    SubtitlePosition.MIDDLE_RIGHT: 6,
+    SubtitlePosition.TOP_LEFT: 7,
+    SubtitlePosition.TOP_CENTER: 8,
+    SubtitlePosition.TOP_RIGHT: 9,
+}
 
 @dataclass
 class SubtitleEntry:
@@ -0,0 +1,53 @@
+import os
+from typing import FrozenSet, Tuple
+
+# Relative paths (from the project_2.0 folder) of every Python file the project is expected to contain
+PROJECT_FILES: Tuple[str, ...] = (
+    "config.py",
+    "models.py",
+    "pipeline.py",
+    "ui_pipeline.py",
+    "write_all_project_files.py", # The script that could write all others (if used)
+    os.path.join("utils", "__init__.py"),
+    os.path.join("utils", "shell_utils.py"),
+    os.path.join("utils", "gcs_utils.py"),
+    os.path.join("utils", "cleanup.py"),
+    os.path.join("utils", "ffmpeg_utils.py"),
+    os.path.join("utils", "audio_utils.py"),
+    os.path.join("utils", "video_utils.py"),
+    os.path.join("ai_integration", "__init__.py"),
+    os.path.join("ai_integration", "gemini_integration.py"),
+    os.path.join("ai_integration", "speech_synthesis.py"),
+    os.path.join("ai_integration", "image_video_generation.py"),
+    os.path.join("media_processing", "__init__.py"),
+    os.path.join("media_processing", "video_editor.py"),
+    os.path.join("new_features", "__init__.py"),
+    os.path.join("new_features", "project_roadmap.py"),
+    os.path.join("new_features", "advanced_tts_controls.py"),
+    os.path.join("new_features", "cost_analyzer.py"),
+    os.path.join("new_features", "dynamic_visual_cues.py"),
+    os.path.join("new_features", "interactive_content_generation.py"),
+    os.path.join("new_features", "intro_outro_templates.py"),
+    os.path.join("new_features", "long_form_adaptation.py"),
+    os.path.join("new_features", "niche_content_specialization.py"),
+    os.path.join("new_features", "integrated_music_library.py"),
+    os.path.join("new_features", "multilingual_support.py"),
+    os.path.join("new_features", "feature_integration_pipeline.py"),
+    os.path.join("new_features", "list_writefiles.py"),
+)
+
+_PROJECT_DIRS: Tuple[str, ...] = tuple(dict.fromkeys(os.path.dirname(file_path_rel) for file_path_rel in PROJECT_FILES))
+
+def present_project_files(project_root_dir: str) -> FrozenSet[str]:
+    """
+    Returns the entries of PROJECT_FILES that exist under project_root_dir, using one directory
+    listing per package instead of a stat() per file, which is slow on Drive-mounted folders.
+    """
+    present = set()
+    for rel_dir in _PROJECT_DIRS:
+        try:
+            with os.scandir(os.path.join(project_root_dir, rel_dir)) as entries:
+                present.update(os.path.join(rel_dir, entry.name) for entry in entries)
+        except OSError:
+            pass # Missing package directory: its files are reported as missing
+    return frozenset(present.intersection(PROJECT_FILES))
@@ -1,6 +1,7 @@
 import logging
 import os
 import shutil # Added for dummy file creation
+import hashlib
 from typing import Optional, Dict, Any
 
 logger = logging.getLogger(__name__)
@@ -49,7 +50,12 @@ def perform_voice_cloning(input_audio_path: str, text_to_synthesize: str) -> Opt
     # 3. Receiving synthesized audio in the cloned voice.
     
     # Placeholder for output
-    output_path = f"/tmp/tiktok_project_runtime/audio/cloned_voice_{hash(text_to_synthesize)}.mp3"
+    # Stable digest (builtin hash() is salted per process) so the same sample and text reuse the earlier clone
+    clone_key = hashlib.blake2b(f"{input_audio_path}\x1f{text_to_synthesize}".encode('utf-8'), digest_size=8).hexdigest()
+    output_path = f"/tmp/tiktok_project_runtime/audio/cloned_voice_{clone_key}.mp3"
+    if os.path.exists(output_path):
+        logger.info(f"Reusing cloned voice audio: {output_path}")
+        return output_path
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     with open(output_path, 'w') as f:
         f.write("DUMMY CLONED VOICE AUDIO")
@@ -1,18 +1,30 @@
 import logging
-from collections import defaultdict
 from datetime import datetime
-from typing import Dict, Union
+from typing import Any, Dict, Union
 
 logger = logging.getLogger(__name__)
 
+# (service, unit) -> (cost_rates key, units the rate is quoted per); unlisted units (e.g. cache_hits) cost nothing
+_RATE_KEYS = {
+    ('gemini_text', 'characters'): ('gemini_text_char_k', 1000),
+    ('gemini_vision', 'seconds'): ('gemini_vision_sec', 1),
+    ('google_tts', 'characters'): ('google_tts_char_k', 1000),
+    ('azure_tts', 'characters'): ('azure_tts_char_k', 1000),
+    ('gtts', 'requests'): ('gtts_requests', 1),
+    ('pexels_video_search', 'requests'): ('pexels_video_search_requests', 1),
+    ('pixabay_video_search', 'requests'): ('pixabay_video_search_requests', 1),
+    ('ai_image_gen', 'images'): ('ai_image_gen_image', 1),
+    ('ai_video_gen', 'seconds'): ('ai_video_gen_sec', 1),
+}
+
 class CostAnalyzer:
     """
     A class to track API usage and estimate costs for various AI services.
     Prices are illustrative and should be updated with actual API pricing.
     """
     def __init__(self):
-        self.usage_metrics = defaultdict(lambda: defaultdict(float)) # {'service': {'unit': total_units}}
-        self.cost_metrics = defaultdict(float) # {'service': total_cost}
+        self.usage_metrics: Dict[str, Dict[str, float]] = {} # {'service': {'unit': total_units}}
+        self.cost_metrics: Dict[str, float] = {} # {'service': total_cost}
 
         # Illustrative costs per unit (e.g., per 1000 characters for TTS, per image for Image Gen)
         self.cost_rates = {
@@ -26,37 +38,15 @@ class CostAnalyzer:
             'ai_image_gen_image': 0.02,   # per image generated (e.g., Imagen, Stable Diffusion)
             'ai_video_gen_sec': 0.05      # per second of AI video generated (e.g., TTV APIs)
         }
+        # Cost of a single unit, so each record_usage adds value * rate instead of re-pricing the whole service
+        self._unit_rates = {key: self.cost_rates[rate_key] / per for key, (rate_key, per) in _RATE_KEYS.items()}
 
     def record_usage(self, service: str, unit: str, value: Union[int, float]):
-        """Records usage for a specific service and unit."""
-        self.usage_metrics[service][unit] += value
-        logger.debug(f"Recorded usage: {service}, {unit}, {value}. Total: {self.usage_metrics[service][unit]}")
-        self._recalculate_cost(service)
-
-    def _recalculate_cost(self, service: str):
-        """Recalculates the cost for a specific service based on current usage."""
-        total_service_cost = 0.0
-        if service == 'gemini_text':
-            total_service_cost += (self.usage_metrics[service]['characters'] / 1000) * self.cost_rates['gemini_text_char_k']
-        elif service == 'gemini_vision':
-            total_service_cost += self.usage_metrics[service]['seconds'] * self.cost_rates['gemini_vision_sec']
-        elif service == 'google_tts':
-            total_service_cost += (self.usage_metrics[service]['characters'] / 1000) * self.cost_rates['google_tts_char_k']
-        elif service == 'azure_tts':
-            total_service_cost += (self.usage_metrics[service]['characters'] / 1000) * self.cost_rates['azure_tts_char_k']
-        elif service == 'gtts':
-            total_service_cost += self.usage_metrics[service]['requests'] * self.cost_rates['gtts_requests']
-        elif service == 'pexels_video_search':
-            total_service_cost += self.usage_metrics[service]['requests'] * self.cost_rates['pexels_video_search_requests']
-        elif service == 'pixabay_video_search':
-            total_service_cost += self.usage_metrics[service]['requests'] * self.cost_rates['pixabay_video_search_requests']
-        elif service == 'ai_image_gen':
-            total_service_cost += self.usage_metrics[service]['images'] * self.cost_rates['ai_image_gen_image']
-        elif service == 'ai_video_gen':
-            total_service_cost += self.usage_metrics[service]['seconds'] * self.cost_rates['ai_video_gen_sec']
-        # Add more services as needed
-
-        self.cost_metrics[service] = total_service_cost
+        """Records usage for a specific service and unit, adding its cost incrementally."""
+        units = self.usage_metrics.setdefault(service, {})
+        units[unit] = units.get(unit, 0.0) + value
+        self.cost_metrics[service] = self.cost_metrics.get(service, 0.0) + value * self._unit_rates.get((service, unit), 0.0)
+        logger.debug(f"Recorded usage: {service}, {unit}, {value}. Total: {units[unit]}")
 
     def get_total_cost(self) -> float:
         """Returns the total estimated cost across all tracked services."""
@@ -79,8 +69,8 @@ class CostAnalyzer:
 
     def reset(self):
         """Resets all usage and cost metrics."""
-        self.usage_metrics = defaultdict(lambda: defaultdict(float))
-        self.cost_metrics = defaultdict(float)
+        self.usage_metrics = {}
+        self.cost_metrics = {}
         logger.info("CostAnalyzer metrics reset.")
 
 # Global instance of CostAnalyzer for easy access across modules (optional, but convenient)
@@ -1,9 +1,80 @@
 import logging
 import os
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
+_REFRAME_SIZES = {
+    "9:16": (1080, 1920),
+    "16:9": (1920, 1080),
+    "1:1": (1080, 1080),
+}
+
+def _reframe_filter(target_aspect_ratio: str) -> str:
+    """Scale-to-cover plus center crop to the target aspect ratio's output size."""
+    if target_aspect_ratio not in _REFRAME_SIZES:
+        logger.warning(f"Unsupported target aspect ratio for smart cropping: {target_aspect_ratio}. Using 9:16.")
+    width, height = _REFRAME_SIZES.get(target_aspect_ratio, _REFRAME_SIZES["9:16"])
+    return f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height},setsar=1"
+
+def _cta_drawtext_filter(video_path: str, cta_text: str, position: str, duration_s: int) -> str:
+    """drawtext filter showing cta_text during the last duration_s seconds of the video."""
+    from utils.ffmpeg_utils import escape_ffmpeg_text
+    from utils.video_utils import get_video_duration as get_vid_duration # Avoid conflict if get_video_duration is elsewhere
+
+    video_duration = get_vid_duration(video_path)
+    if video_duration is None:
+        logger.warning(f"Could not get video duration for {video_path}, setting CTA duration to 5s.")
+        start_time_s = 0
+    else:
+        # Default to appearing in the last 'duration_s' seconds
+        start_time_s = max(0, video_duration - duration_s)
+
+    end_time_s = start_time_s + duration_s
+
+    # Escape text for FFmpeg's drawtext filter
+    escaped_cta_text = escape_ffmpeg_text(cta_text)
+
+    # Position logic for drawtext filter (simplified example)
+    x_pos = "(w-text_w)/2" # Center horizontally
+    y_pos = "h-th-50" if position == "bottom" else "50" # 50px from bottom/top
+
+    return (
+        f"drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf:"
+        f"text='{escaped_cta_text}':"
+        f"x={x_pos}:y={y_pos}:"
+        f"fontsize=70:fontcolor=white:borderw=3:bordercolor=black:"
+        f"enable='between(t,{start_time_s},{end_time_s})'"
+    )
+
+def _run_video_filter(video_path: str, output_path: str, video_filter: str, timeout: int = 120) -> Tuple[str, str, int]:
+    """
+    Re-encodes video_path through video_filter in one pass, copying the audio. Runs in-process through PyAV
+    when it is installed (no ffmpeg process start per edit), otherwise or on failure via the ffmpeg CLI.
+    """
+    from utils.shell_utils import run_shell_command
+    from utils.av_runtime import HAS_PYAV, filter_video
+
+    if HAS_PYAV:
+        try:
+            filter_video(video_path, output_path, video_filter)
+            return '', '', 0
+        except Exception as e: # e.g. a PyAV build without drawtext/freetype
+            logger.warning(f"In-process filtering of {video_path} failed, using the ffmpeg CLI: {e}")
+
+    cmd = [
+        'ffmpeg', '-y',
+        '-i', video_path,
+        '-vf', video_filter,
+        '-c:a', 'copy',
+        '-c:v', 'libx264',
+        '-preset', 'fast',
+        '-crf', '23',
+        '-pix_fmt', 'yuv420p',
+        output_path
+    ]
+    return run_shell_command(cmd, check_error=False, timeout=timeout)
+
 def apply_smart_cropping_reframing(video_path: str, output_path: str, target_aspect_ratio: str = "9:16") -> Optional[str]:
     """
     Applies AI-driven smart cropping and re-framing to a video.
@@ -14,38 +85,13 @@ def apply_smart_cropping_reframing(video_path: str, output_path: str, target_asp
     # TODO: Integrate OpenCV, MediaPipe or other CV libraries for object/face detection
     # and dynamic cropping. This is complex and involves frame-by-frame analysis.
 
-    # For now, it simply scales to the target aspect ratio as a basic re-framing.
-    width, height = 0, 0
-    if target_aspect_ratio == "9:16":
-        width, height = 1080, 1920
-    elif target_aspect_ratio == "16:9":
-        width, height = 1920, 1080
-    elif target_aspect_ratio == "1:1":
-        width, height = 1080, 1080
-    else:
-        logger.warning(f"Unsupported target aspect ratio for smart cropping: {target_aspect_ratio}. Using 9:16.")
-        width, height = 1080, 1920
-
     if not os.path.exists(video_path):
         logger.error(f"Input video for smart cropping not found: {video_path}")
         return None
-        
+
     # Placeholder FFmpeg command to scale and crop to the target aspect ratio
     # This is not "smart" but demonstrates the output action.
-    from utils.shell_utils import run_shell_command
-    
-    cmd = [
-        'ffmpeg', '-y',
-        '-i', shlex.quote(video_path),
-        '-vf', f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height}",
-        '-c:a', 'copy',
-        '-c:v', 'libx264',
-        '-preset', 'fast',
-        '-crf', '23',
-        '-pix_fmt', 'yuv420p',
-        shlex.quote(output_path)
-    ]
-    stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=120)
+    stdout, stderr, returncode = _run_video_filter(video_path, output_path, _reframe_filter(target_aspect_ratio))
 
     if returncode != 0:
         logger.error(f"FFmpeg failed to simulate smart cropping: {stderr}")
@@ -63,51 +109,42 @@ def generate_call_to_action_overlay(video_path: str, output_path: str, cta_text:
     if not os.path.exists(video_path):
         logger.error(f"Video file not found for CTA overlay: {video_path}")
         return None
-        
-    from utils.ffmpeg_utils import escape_ffmpeg_text
-    from utils.shell_utils import run_shell_command
-    from utils.video_utils import get_video_duration as get_vid_duration # Avoid conflict if get_video_duration is elsewhere
 
-    video_duration = get_vid_duration(video_path)
-    if video_duration is None:
-        logger.warning(f"Could not get video duration for {video_path}, setting CTA duration to 5s.")
-        start_time_s = 0
-    else:
-        # Default to appearing in the last 'duration_s' seconds
-        start_time_s = max(0, video_duration - duration_s)
-        
-    end_time_s = start_time_s + duration_s
+    stdout, stderr, returncode = _run_video_filter(video_path, output_path, _cta_drawtext_filter(video_path, cta_text, position, duration_s))
 
-    # Escape text for FFmpeg's drawtext filter
-    escaped_cta_text = escape_ffmpeg_text(cta_text)
-    
-    # Position logic for drawtext filter (simplified example)
-    x_pos = "(w-text_w)/2" # Center horizontally
-    y_pos = "h-th-50" if position == "bottom" else "50" # 50px from bottom/top
+    if returncode != 0:
+        logger.error(f"FFmpeg failed to add CTA overlay: {stderr}")
+        return None
 
-    drawtext_filter = (
-        f"drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf:"
-        f"text='{escaped_cta_text}':"
-        f"x={x_pos}:y={y_pos}:"
-        f"fontsize=70:fontcolor=white:borderw=3:bordercolor=black:"
-        f"enable='between(t,{start_time_s},{end_time_s})'"
-    )
+    logger.info(f"CTA overlay added. Output: {output_path}")
+    return output_path
 
-    cmd = [
-        'ffmpeg', '-y',
-        '-i', shlex.quote(video_path),
-        '-vf', drawtext_filter,
-        '-c:a', 'copy',
-        '-c:v', 'libx264', '-preset', 'fast', '-crf', '23', '-pix_fmt', 'yuv420p',
-        shlex.quote(output_path)
-    ]
-    stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=120)
+def reframe_with_call_to_action(
+    video_path: str,
+    output_path: str,
+    target_aspect_ratio: str = "9:16",
+    cta_text: str = "Learn More!",
+    position: str = "bottom",
+    duration_s: int = 5
+) -> Optional[str]:
+    """
+    apply_smart_cropping_reframing followed by generate_call_to_action_overlay, fused into one filter chain:
+    a single decode/encode pass and no intermediate cropped file.
+    """
+    logger.info(f"Re-framing {video_path} to {target_aspect_ratio} with CTA overlay '{cta_text}'...")
+    if not os.path.exists(video_path):
+        logger.error(f"Input video for re-framing/CTA not found: {video_path}")
+        return None
+
+    # The CTA timing only depends on duration, which cropping doesn't change, so it can be computed from the input
+    video_filter = f"{_reframe_filter(target_aspect_ratio)},{_cta_drawtext_filter(video_path, cta_text, position, duration_s)}"
+    stdout, stderr, returncode = _run_video_filter(video_path, output_path, video_filter)
 
     if returncode != 0:
-        logger.error(f"FFmpeg failed to add CTA overlay: {stderr}")
+        logger.error(f"FFmpeg failed to re-frame with CTA overlay: {stderr}")
         return None
 
-    logger.info(f"CTA overlay added. Output: {output_path}")
+    logger.info(f"Re-framing with CTA overlay complete. Output: {output_path}")
     return output_path
 
 def implement_ai_style_transfer(input_video_path: str, output_path: str, style_image_path: str) -> Optional[str]:
@@ -127,6 +164,7 @@ def implement_ai_style_transfer(input_video_path: str, output_path: str, style_i
         # Fallback to a generic style if image is missing.
 
     # Placeholder: simply copy the input video to output to simulate success
-    shutil.copy(input_video_path, output_path)
+    from utils.file_utils import clone_file
+    clone_file(input_video_path, output_path)
     logger.info(f"Placeholder AI style transfer complete. Output: {output_path}")
     return output_path
@@ -20,8 +20,10 @@ def conduct_user_feedback_loop(current_content_draft: Dict[str, Any]) -> Dict[st
     refined_content = current_content_draft.copy()
     if "script" in refined_content:
         refined_content["script"] += "\n[User feedback applied: Script made more concise.]"
-    if "video_clips" in refined_content and refined_content["video_clips"]:
-        refined_content["video_clips"] = refined_content["video_clips"][:int(len(refined_content["video_clips"]) * 0.8)]
+    video_clips = refined_content.get("video_clips")
+    if video_clips:
+        # The clip list is shared with the caller's draft, so it is sliced (one copy of the kept clips), never trimmed in place
+        refined_content["video_clips"] = video_clips[:int(len(video_clips) * 0.8)]
         logger.info("Removed some video clips based on simulated feedback.")
     
     logger.info("Simulated user feedback loop complete. Content refined.")
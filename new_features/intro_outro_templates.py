@@ -1,6 +1,7 @@
 import logging
 import os
 import shutil
+import concurrent.futures
 from typing import Optional, List
 
 logger = logging.getLogger(__name__)
@@ -10,39 +11,108 @@ _DUMMY_TEMPLATE_DIR = "/tmp/tiktok_project_runtime/templates"
 _DUMMY_INTRO_VIDEO = os.path.join(_DUMMY_TEMPLATE_DIR, "intro_template.mp4")
 _DUMMY_OUTRO_VIDEO = os.path.join(_DUMMY_TEMPLATE_DIR, "outro_template.mp4")
 
-def _create_dummy_template_files():
-    """Creates dummy video files for testing templates."""
+_TEMPLATES_CREATED = False
+
+def _create_dummy_template_files(force: bool = False):
+    """
+    Creates dummy video files for testing templates, encoding the missing ones concurrently.
+    After the first call this is a no-op unless force is set (e.g. the runtime dir was cleaned since).
+    """
+    global _TEMPLATES_CREATED
+    if _TEMPLATES_CREATED and not force:
+        return
     os.makedirs(_DUMMY_TEMPLATE_DIR, exist_ok=True)
     from utils.shell_utils import run_shell_command
-    from utils.video_utils import get_video_duration # Use local alias to prevent collision
 
+    commands = []
     if not os.path.exists(_DUMMY_INTRO_VIDEO):
         logger.info(f"Creating dummy intro video: {_DUMMY_INTRO_VIDEO}")
-        cmd_intro = ['ffmpeg', '-y', '-f', 'lavfi', '-i', 'color=c=blue:s=1280x720:d=3,format=yuv420p', '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '30', _DUMMY_INTRO_VIDEO]
-        run_shell_command(cmd_intro, check_error=False, timeout=10)
+        commands.append(['ffmpeg', '-y', '-f', 'lavfi', '-i', 'color=c=blue:s=1280x720:d=3,format=yuv420p', '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '30', _DUMMY_INTRO_VIDEO])
     
     if not os.path.exists(_DUMMY_OUTRO_VIDEO):
         logger.info(f"Creating dummy outro video: {_DUMMY_OUTRO_VIDEO}")
-        cmd_outro = ['ffmpeg', '-y', '-f', 'lavfi', '-i', 'color=c=red:s=1280x720:d=3,format=yuv420p', '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '30', _DUMMY_OUTRO_VIDEO]
-        run_shell_command(cmd_outro, check_error=False, timeout=10)
+        commands.append(['ffmpeg', '-y', '-f', 'lavfi', '-i', 'color=c=red:s=1280x720:d=3,format=yuv420p', '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '30', _DUMMY_OUTRO_VIDEO])
+
+    if commands:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            list(executor.map(lambda cmd: run_shell_command(cmd, check_error=False, timeout=10), commands))
+    _TEMPLATES_CREATED = True
+
+def _dummy_template(template_path: str) -> Optional[str]:
+    """Returns template_path once the dummy templates exist, recreating them if they were removed since."""
+    _create_dummy_template_files()
+    if not os.path.exists(template_path):
+        _create_dummy_template_files(force=True)
+    return template_path if os.path.exists(template_path) else None
+
+_TEMPLATE_COLORS = {'intro': 'blue', 'outro': 'red'}
+_CHANNEL_LAYOUTS = {1: 'mono', 2: 'stereo'}
+# ffprobe's H.264 profile names -> libx264 -profile:v (x264 writes Baseline as Constrained Baseline)
+_X264_PROFILES = {'High': 'high', 'Main': 'main', 'Constrained Baseline': 'baseline', 'Baseline': 'baseline'}
+
+def _template_matching(kind: str, main_video_path: str) -> Optional[str]:
+    """
+    Returns the dummy `kind` template encoded in the main video's profile (H.264 yuv420p at its size, frame rate,
+    time base, profile and level, plus silent AAC matching its audio), creating it on first use. Matching clips let
+    concatenate_videos stream-copy through the concat demuxer instead of re-encoding both videos.
+    Returns None if the main video can't be probed.
+    """
+    from utils.shell_utils import run_shell_command
+    from utils.video_utils import probe_video
+
+    probe = probe_video(main_video_path)
+    streams = probe.get('streams', []) if probe else []
+    video = next((st for st in streams if st.get('codec_type') == 'video'), None)
+    if video is None or not video.get('width') or not video.get('height'):
+        return None
+    audio = next((st for st in streams if st.get('codec_type') == 'audio'), None)
+
+    width, height = video['width'], video['height']
+    frame_rate = video.get('avg_frame_rate') or '30'
+    if frame_rate.startswith('0'): # '0/0' when unknown
+        frame_rate = '30'
+    profile = _X264_PROFILES.get(video.get('profile'))
+    level = video.get('level')
+    if not profile or not level or level <= 0:
+        return None # concatenate_videos would re-encode anyway, so the plain dummy template will do
+    timescale = (video.get('time_base') or '').partition('/')[2] or '15360'
+    layout = _CHANNEL_LAYOUTS.get(audio.get('channels')) if audio else None
+    sample_rate = audio.get('sample_rate') if layout else None
+
+    audio_suffix = f"_{sample_rate}hz_{layout}" if sample_rate else ''
+    encoding = f"{profile}{level}_{timescale}tb"
+    template_path = os.path.join(_DUMMY_TEMPLATE_DIR, f"{kind}_template_{width}x{height}_{frame_rate.replace('/', '-')}fps_{encoding}{audio_suffix}.mp4")
+    if os.path.exists(template_path):
+        return template_path
 
+    os.makedirs(_DUMMY_TEMPLATE_DIR, exist_ok=True)
+    logger.info(f"Creating {kind} template matching {main_video_path}: {template_path}")
+    cmd = ['ffmpeg', '-y', '-f', 'lavfi', '-i', f"color=c={_TEMPLATE_COLORS[kind]}:s={width}x{height}:r={frame_rate}:d=3"]
+    if sample_rate:
+        cmd += ['-f', 'lavfi', '-i', f"anullsrc=r={sample_rate}:cl={layout}", '-shortest', '-c:a', 'aac']
+    # Not ultrafast: it disables the High-profile tools, and x264 then signals Constrained Baseline whatever -profile:v says
+    cmd += ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '30', '-profile:v', profile, '-level:v', str(level),
+            '-pix_fmt', 'yuv420p', '-video_track_timescale', timescale, template_path]
+    stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=30)
+    if returncode != 0:
+        logger.warning(f"Could not create matching {kind} template: {stderr}")
+        return None
+    return template_path
 
 def get_available_intro_templates() -> List[str]:
     """
     Retrieves a list of available intro video templates.
     This is a placeholder; in a real system, it would query a template database or storage.
     """
-    _create_dummy_template_files() # Ensure dummy files exist for demonstration
     logger.info("Retrieving available intro templates.")
-    return ["Standard Intro", "Dynamic Title Intro"] if os.path.exists(_DUMMY_INTRO_VIDEO) else []
+    return ["Standard Intro", "Dynamic Title Intro"] if _dummy_template(_DUMMY_INTRO_VIDEO) else []
 
 def get_available_outro_templates() -> List[str]:
     """
     Retrieves a list of available outro video templates.
     """
-    _create_dummy_template_files() # Ensure dummy files exist for demonstration
     logger.info("Retrieving available outro templates.")
-    return ["Standard Outro", "Social Media CTA Outro"] if os.path.exists(_DUMMY_OUTRO_VIDEO) else []
+    return ["Standard Outro", "Social Media CTA Outro"] if _dummy_template(_DUMMY_OUTRO_VIDEO) else []
 
 def apply_intro_template(main_video_path: str, intro_template_name: str, output_path: str) -> Optional[str]:
     """
@@ -50,23 +120,23 @@ def apply_intro_template(main_video_path: str, intro_template_name: str, output_
     This is a conceptual placeholder using simple FFmpeg concatenation.
     """
     logger.info(f"Applying intro template '{intro_template_name}' to {main_video_path}...")
-    _create_dummy_template_files() # Ensure dummy files exist
     
     if not os.path.exists(main_video_path):
         logger.error(f"Main video not found for intro application: {main_video_path}")
         return None
 
-    intro_video_path = _DUMMY_INTRO_VIDEO # Use the dummy intro for now
+    # Use the dummy intro for now, encoded like the main video when possible so the join is a stream copy
+    intro_video_path = _template_matching('intro', main_video_path) or _dummy_template(_DUMMY_INTRO_VIDEO)
 
-    if not os.path.exists(intro_video_path):
-        logger.error(f"Intro template video not found at expected path: {intro_video_path}")
+    if not intro_video_path:
+        logger.error(f"Intro template video not found at expected path: {_DUMMY_INTRO_VIDEO}")
         return None
     
     from utils.ffmpeg_utils import concatenate_videos
     
     # Simple concatenation (no complex transitions here for template joining)
     # Get properties of the main video to ensure consistency
-    from utils.video_utils import get_video_resolution
+    from utils.video_utils import get_video_resolution, get_video_duration
     width, height = get_video_resolution(main_video_path)
     if not width or not height:
         logger.warning(f"Could not get resolution of main video {main_video_path}. Using default 1080x1920 for concat.")
@@ -94,20 +164,20 @@ def apply_outro_template(main_video_path: str, outro_template_name: str, output_
     This is a conceptual placeholder using simple FFmpeg concatenation.
     """
     logger.info(f"Applying outro template '{outro_template_name}' to {main_video_path}...")
-    _create_dummy_template_files() # Ensure dummy files exist
 
     if not os.path.exists(main_video_path):
         logger.error(f"Main video not found for outro application: {main_video_path}")
         return None
 
-    outro_video_path = _DUMMY_OUTRO_VIDEO # Use the dummy outro for now
+    # Use the dummy outro for now, encoded like the main video when possible so the join is a stream copy
+    outro_video_path = _template_matching('outro', main_video_path) or _dummy_template(_DUMMY_OUTRO_VIDEO)
 
-    if not os.path.exists(outro_video_path):
-        logger.error(f"Outro template video not found at expected path: {outro_video_path}")
+    if not outro_video_path:
+        logger.error(f"Outro template video not found at expected path: {_DUMMY_OUTRO_VIDEO}")
         return None
 
     from utils.ffmpeg_utils import concatenate_videos
-    from utils.video_utils import get_video_resolution
+    from utils.video_utils import get_video_resolution, get_video_duration
     
     width, height = get_video_resolution(main_video_path)
     if not width or not height:
@@ -129,3 +199,47 @@ def apply_outro_template(main_video_path: str, outro_template_name: str, output_
 
     logger.info(f"Outro template applied. Output: {concatenated_path}")
     return concatenated_path
+
+def apply_intro_and_outro_template(main_video_path: str, intro_template_name: str, outro_template_name: str, output_path: str) -> Optional[str]:
+    """
+    Wraps the main video in an intro and an outro with a single concatenation pass,
+    instead of chaining apply_intro_template and apply_outro_template through an intermediate file.
+    """
+    logger.info(f"Applying intro '{intro_template_name}' and outro '{outro_template_name}' to {main_video_path}...")
+
+    if not os.path.exists(main_video_path):
+        logger.error(f"Main video not found for template application: {main_video_path}")
+        return None
+
+    intro_video_path = _template_matching('intro', main_video_path) or _dummy_template(_DUMMY_INTRO_VIDEO)
+    outro_video_path = _template_matching('outro', main_video_path) or _dummy_template(_DUMMY_OUTRO_VIDEO)
+
+    if not intro_video_path or not outro_video_path:
+        logger.error(f"Template videos not found at expected paths: {_DUMMY_INTRO_VIDEO}, {_DUMMY_OUTRO_VIDEO}")
+        return None
+
+    from utils.ffmpeg_utils import concatenate_videos
+    from utils.video_utils import get_video_resolution, get_video_duration
+
+    width, height = get_video_resolution(main_video_path)
+    if not width or not height:
+        logger.warning(f"Could not get resolution of main video {main_video_path}. Using default 1080x1920 for concat.")
+        width, height = 1080, 1920 # Fallback
+
+    # One concat list of intro, main, outro: stream-copied when the templates match the main video's profile
+    video_paths = [intro_video_path, main_video_path, outro_video_path]
+    concatenated_path = concatenate_videos(
+        video_paths=video_paths,
+        output_path=output_path,
+        target_width=width,
+        target_height=height,
+        target_duration=sum(get_video_duration(path) or 0 for path in video_paths),
+        transition="none"
+    )
+
+    if not concatenated_path:
+        logger.error("Failed to apply intro and outro templates via concatenation.")
+        return None
+
+    logger.info(f"Intro and outro templates applied. Output: {concatenated_path}")
+    return concatenated_path
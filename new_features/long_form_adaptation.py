@@ -1,19 +1,14 @@
 import logging
 import math
-from typing import List, Dict, Any, Optional
+import os
+import struct
+import concurrent.futures
+from typing import List, Dict, Any, Optional, Union
 
 logger = logging.getLogger(__name__)
 
-def adapt_script_for_long_form(short_script: str, target_duration_minutes: int) -> Optional[str]:
-    """
-    Adapts a short-form script for a longer duration using LLMs.
-    This is a conceptual placeholder.
-    """
-    logger.info(f"Adapting script for target duration: {target_duration_minutes} minutes.")
-    # TODO: Use an LLM (e.g., Gemini) to expand the short script.
-    # This would involve prompting the LLM to elaborate on points, add examples, or introduce new sub-topics.
-    
-    expanded_script = f"""
+# Filled with str.format per call; only the script and duration vary
+_LONG_FORM_TEMPLATE = """
     [EXPANDED LONG-FORM SCRIPT]
 
     Initial script:
@@ -21,7 +16,7 @@ def adapt_script_for_long_form(short_script: str, target_duration_minutes: int)
     {short_script}
     ---
 
-    This script has been expanded to support a target duration of {target_duration_minutes} minutes.
+    This script has been expanded to support a target duration of {minutes} minutes.
     More details, examples, and deeper dives into each topic would be generated here by an LLM.
 
     Example expansion points:
@@ -32,17 +27,78 @@ def adapt_script_for_long_form(short_script: str, target_duration_minutes: int)
 
     [END OF EXPANDED SCRIPT]
     """
+
+def adapt_script_for_long_form(short_script: str, target_duration_minutes: int) -> Optional[str]:
+    """
+    Adapts a short-form script for a longer duration using LLMs.
+    This is a conceptual placeholder.
+    """
+    logger.info(f"Adapting script for target duration: {target_duration_minutes} minutes.")
+    # TODO: Use an LLM (e.g., Gemini) to expand the short script.
+    # This would involve prompting the LLM to elaborate on points, add examples, or introduce new sub-topics.
+    
+    expanded_script = _LONG_FORM_TEMPLATE.format(short_script=short_script, minutes=target_duration_minutes)
     logger.info("Script adaptation simulated.")
     return expanded_script
 
-def segment_video_for_chapters(video_path: str, chapter_markers: List[Dict[str, Union[str, float]]]) -> Optional[Dict[str, Any]]:
+_THREADS_PER_JOB = 4 # One libx264 process stops scaling well beyond a few threads; run several such jobs instead
+
+def _job_pool_size(threads_per_job: int, jobs: int) -> int:
+    """Concurrent ffmpeg jobs so that jobs * threads_per_job roughly fills the CPUs."""
+    return max(1, min(jobs, (os.cpu_count() or 1) // max(1, threads_per_job)))
+
+def _cut_chapter(video_path: str, start_s: float, end_s: float, output_path: str, accurate: bool, threads: int) -> bool:
+    """
+    Cuts [start_s, end_s) into output_path: a stream copy (cuts land on keyframes) by default, or a
+    frame-accurate re-encode limited to `threads` encoder threads when accurate is set.
+    """
+    from utils.shell_utils import run_shell_command
+
+    cmd = ['ffmpeg', '-y', '-ss', f"{start_s:.3f}", '-to', f"{end_s:.3f}", '-i', video_path]
+    if accurate:
+        cmd += ['-threads', str(threads), '-c:v', 'libx264', '-preset', 'fast', '-crf', '23', '-pix_fmt', 'yuv420p', '-c:a', 'aac']
+    else:
+        cmd += ['-c', 'copy', '-avoid_negative_ts', 'make_zero']
+    cmd.append(output_path)
+    stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=600)
+    if returncode != 0:
+        logger.error(f"FFmpeg failed to cut chapter {output_path}: {stderr}")
+        return False
+    return True
+
+def _segment_contiguous_chapters(video_path: str, chapters: List[Dict[str, Any]], output_pattern: str) -> bool:
+    """
+    Stream-copies back-to-back chapters with one ffmpeg segment-muxer run (one read of the input, one process)
+    instead of a process per chapter. Outputs are output_pattern with %d = 1..N.
+    """
+    from utils.shell_utils import run_shell_command
+
+    first_start = chapters[0]["start_time_s"]
+    split_times = ','.join(f"{chapter['end_time_s'] - first_start:.3f}" for chapter in chapters[:-1])
+    cmd = [
+        'ffmpeg', '-y', '-ss', f"{first_start:.3f}", '-to', f"{chapters[-1]['end_time_s']:.3f}", '-i', video_path,
+        '-map', '0', '-c', 'copy', '-f', 'segment', '-segment_times', split_times,
+        '-reset_timestamps', '1', '-segment_start_number', '1', output_pattern
+    ]
+    stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=600)
+    if returncode != 0:
+        logger.warning(f"FFmpeg segment muxer failed for {video_path}, cutting chapters individually: {stderr}")
+        return False
+    return all(os.path.exists(chapter["output_file"]) for chapter in chapters)
+
+def segment_video_for_chapters(
+    video_path: str,
+    chapter_markers: List[Dict[str, Union[str, float]]],
+    accurate_cuts: bool = False,
+    threads_per_job: int = _THREADS_PER_JOB
+) -> Optional[Dict[str, Any]]:
     """
     Segments a long-form video into chapters based on provided markers.
-    This is a conceptual placeholder using FFmpeg's segmenter or just logging.
+    Back-to-back chapters are stream-copied in a single segment-muxer pass; otherwise (or with accurate_cuts)
+    chapters are cut by separate ffmpeg processes running concurrently, cpu_count // threads_per_job at a time.
+    Chapters that fail to cut are left out of the result.
     """
-    logger.info(f"Simulating segmentation of {video_path} into {len(chapter_markers)} chapters.")
-    # TODO: Implement FFmpeg segmentation commands or advanced video processing to cut video at markers.
-    # This might involve creating multiple output files or a chapter metadata file.
+    logger.info(f"Segmenting {video_path} into {len(chapter_markers)} chapters.")
 
     if not os.path.exists(video_path):
         logger.error(f"Video file not found for segmentation: {video_path}")
@@ -53,23 +109,20 @@ def segment_video_for_chapters(video_path: str, chapter_markers: List[Dict[str,
         "chapters": []
     }
 
-    # Simulate creating dummy chapter files
     from utils.video_utils import get_video_duration
     video_duration = get_video_duration(video_path) or 0
     
+    # Output names keep the input's extension, so a stream copy stays in its container and never targets the input
+    base_path, extension = os.path.splitext(video_path)
+    chapters = []
     current_time = 0.0
     for i, marker in enumerate(chapter_markers):
         chapter_name = marker.get("name", f"Chapter {i+1}")
-        chapter_start = marker.get("start_time_s", current_time)
-        chapter_end = marker.get("end_time_s", min(chapter_start + 60, video_duration)) # Default 1 min or end of video
-        
-        chapter_output_path = video_path.replace(".mp4", f"_chapter_{i+1}.mp4")
+        chapter_start = float(marker.get("start_time_s", current_time))
+        chapter_end = float(marker.get("end_time_s", min(chapter_start + 60, video_duration))) # Default 1 min or end of video
         
-        # Simulate chapter creation by copying or creating a dummy segment
-        with open(chapter_output_path, 'w') as f:
-            f.write(f"DUMMY CONTENT FOR {chapter_name} ({chapter_start}-{chapter_end})")
-
-        segmented_output_details["chapters"].append({
+        chapter_output_path = f"{base_path}_chapter_{i+1}{extension}"
+        chapters.append({
             "name": chapter_name,
             "start_time_s": chapter_start,
             "end_time_s": chapter_end,
@@ -77,9 +130,67 @@ def segment_video_for_chapters(video_path: str, chapter_markers: List[Dict[str,
         })
         current_time = chapter_end
 
-    logger.info("Video segmentation simulated.")
+    contiguous = all(abs(chapter["start_time_s"] - previous["end_time_s"]) < 0.001 for previous, chapter in zip(chapters, chapters[1:]))
+    output_pattern = f"{base_path}_chapter_%d{extension}"
+    if not accurate_cuts and len(chapters) > 1 and contiguous and '%' not in video_path:
+        if _segment_contiguous_chapters(video_path, chapters, output_pattern):
+            segmented_output_details["chapters"] = chapters
+            logger.info(f"Video segmentation complete: {len(chapters)} chapters written in one pass.")
+            return segmented_output_details
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_job_pool_size(threads_per_job, len(chapters)), thread_name_prefix='chapter') as executor:
+        results = list(executor.map(
+            lambda chapter: _cut_chapter(video_path, chapter["start_time_s"], chapter["end_time_s"], chapter["output_file"], accurate_cuts, threads_per_job),
+            chapters
+        ))
+    segmented_output_details["chapters"] = [chapter for chapter, ok in zip(chapters, results) if ok]
+
+    logger.info(f"Video segmentation complete: {len(segmented_output_details['chapters'])}/{len(chapters)} chapters written.")
     return segmented_output_details
 
+def _is_faststart(video_path: str) -> bool:
+    """True if the MP4's top-level moov box comes before mdat, i.e. playback can start before the whole file loads."""
+    try:
+        with open(video_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            offset = 0
+            while offset + 8 <= file_size:
+                f.seek(offset)
+                box_size, box_type = struct.unpack('>I4s', f.read(8))
+                if box_type == b'moov':
+                    return True
+                if box_type == b'mdat':
+                    return False
+                if box_size == 1: # 64-bit size follows the type
+                    box_size = struct.unpack('>Q', f.read(8))[0]
+                if box_size < 8:
+                    return False
+                offset += box_size
+    except (OSError, struct.error):
+        pass
+    return False
+
+def _link_or_copy(source_path: str, target_path: str) -> None:
+    """Hard-links target_path to source_path, copying instead across filesystems or where links aren't supported."""
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        from utils.file_utils import clone_file
+        clone_file(source_path, target_path)
+
+def _remux_faststart(video_path: str, output_path: str) -> bool:
+    """Stream-copies video_path into output_path with the moov box moved to the front."""
+    from utils.shell_utils import run_shell_command
+
+    cmd = ['ffmpeg', '-y', '-i', video_path, '-map', '0', '-c', 'copy', '-movflags', '+faststart', '-f', 'mp4', output_path]
+    stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=600)
+    if returncode != 0:
+        logger.error(f"FFmpeg fast-start remux failed: {stderr}")
+        return False
+    return True
+
 def optimize_for_platform(video_path: str, platform: str) -> Optional[str]:
     """
     Optimizes a video for specific platforms (e.g., YouTube, Vimeo) for long-form content.
@@ -93,10 +204,21 @@ def optimize_for_platform(video_path: str, platform: str) -> Optional[str]:
         logger.error(f"Video file not found for optimization: {video_path}")
         return None
 
-    optimized_path = video_path.replace(".mp4", f"_{platform}_optimized.mp4")
+    base_path, extension = os.path.splitext(video_path)
+    optimized_path = f"{base_path}_{platform}_optimized{extension}"
     
-    # Placeholder: simply copy the file and rename
-    shutil.copy(video_path, optimized_path)
+    # Placeholder: no platform-specific encoding yet. A file whose moov box already precedes the media data is
+    # hard-linked (no bytes copied); otherwise it is remuxed with +faststart, which streaming platforms prefer
+    if _is_faststart(video_path):
+        _link_or_copy(video_path, optimized_path)
+    elif not _remux_faststart(video_path, optimized_path):
+        logger.warning(f"Fast-start remux failed for {video_path}, copying it unchanged.")
+        _link_or_copy(video_path, optimized_path)
 
     logger.info(f"Video optimization for {platform} simulated. Output: {optimized_path}")
     return optimized_path
+
+def optimize_for_platforms(video_path: str, platforms: List[str], threads_per_job: int = _THREADS_PER_JOB) -> Dict[str, Optional[str]]:
+    """Runs optimize_for_platform for several platforms concurrently; returns {platform: optimized path or None}."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_job_pool_size(threads_per_job, len(platforms)), thread_name_prefix='optimize') as executor:
+        return dict(zip(platforms, executor.map(lambda platform: optimize_for_platform(video_path, platform), platforms)))
@@ -1,4 +1,7 @@
 import logging
+import re
+import functools
+import concurrent.futures
 from typing import List, Dict, Any, Optional
 
 # For Google Cloud Translation API (conceptual import)
@@ -6,6 +9,40 @@ from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Simple placeholder translations for demonstration
+_PLACEHOLDER_TRANSLATIONS = {
+    "en": {"hello": "hello", "world": "world", "ai": "AI"},
+    "es": {"hello": "hola", "world": "mundo", "ai": "IA"},
+    "fr": {"hello": "bonjour", "world": "monde", "ai": "IA"},
+    "de": {"hello": "hallo", "world": "welt", "ai": "KI"},
+}
+
+# One alternation per language matching a known word as a whole whitespace-delimited token,
+# so a translation is a single C-level substitution instead of a Python loop over words
+_PLACEHOLDER_PATTERNS = {
+    lang: re.compile(r'(?<!\S)(?:' + '|'.join(map(re.escape, words)) + r')(?!\S)')
+    for lang, words in _PLACEHOLDER_TRANSLATIONS.items()
+}
+
+_MAX_TRANSLATION_WORKERS = 8
+
+# Checked in order, so English wins over Spanish over French when keywords of several appear
+_DETECTION_KEYWORDS = (
+    ("en", ("hello", "apple")),
+    ("es", ("hola", "manzana")),
+    ("fr", ("bonjour", "pomme")),
+)
+
+@functools.lru_cache(maxsize=8192) # Caption tracks repeat short phrases a lot
+def _placeholder_translate(text: str, target_language_code: str) -> str:
+    """Lowercases and whitespace-normalizes text, then swaps known words for target_language_code."""
+    normalized = " ".join(text.lower().split())
+    pattern = _PLACEHOLDER_PATTERNS.get(target_language_code)
+    if pattern is not None:
+        words = _PLACEHOLDER_TRANSLATIONS[target_language_code]
+        normalized = pattern.sub(lambda match: words[match.group(0)], normalized)
+    return f"{normalized} [Translated to {target_language_code}]"
+
 def translate_text(text: str, target_language_code: str, source_language_code: Optional[str] = None) -> Optional[str]:
     """
     Translates text using a translation API (e.g., Google Cloud Translation API).
@@ -23,22 +60,19 @@ def translate_text(text: str, target_language_code: str, source_language_code: O
     # )
     # return response.translations[0].translated_text
 
-    # Simple placeholder translation for demonstration
-    translations = {
-        "en": {"hello": "hello", "world": "world", "ai": "AI"},
-        "es": {"hello": "hola", "world": "mundo", "ai": "IA"},
-        "fr": {"hello": "bonjour", "world": "monde", "ai": "IA"},
-        "de": {"hello": "hallo", "world": "welt", "ai": "KI"},
-    }
-    
-    translated_words = []
-    for word in text.lower().split():
-        translated_words.append(translations.get(target_language_code, {}).get(word, word))
-    
-    translated_text = " ".join(translated_words) + f" [Translated to {target_language_code}]"
+    translated_text = _placeholder_translate(text, target_language_code)
     logger.info(f"Simulated translation: '{text[:50]}...' -> '{translated_text[:50]}...'")
     return translated_text
 
+def translate_texts(texts: List[str], target_language_code: str, source_language_code: Optional[str] = None) -> List[Optional[str]]:
+    """
+    Batch form of translate_text: one request for the whole list, as the Translation API's `contents` accepts.
+    This is a functional placeholder.
+    """
+    logger.info(f"Simulating translation of {len(texts)} texts to {target_language_code}...")
+    # TODO: Same client call as translate_text with contents=texts, returning each translated_text in order.
+    return [_placeholder_translate(text, target_language_code) for text in texts]
+
 def generate_multilingual_captions(original_captions: List[Dict[str, Any]], target_languages: List[str]) -> Dict[str, List[Dict[str, Any]]]:
     """
     Generates captions in multiple languages based on original captions.
@@ -47,17 +81,24 @@ def generate_multilingual_captions(original_captions: List[Dict[str, Any]], targ
     logger.info(f"Generating multilingual captions for languages: {target_languages}")
     multilingual_captions = {"original": original_captions}
 
-    for lang in target_languages:
-        translated_captions = []
-        for entry in original_captions:
-            translated_text = translate_text(entry['text'], lang, source_language_code="en") # Assuming original is English
-            if translated_text:
-                translated_captions.append({
-                    "text": translated_text,
-                    "start_time_s": entry['start_time_s'],
-                    "end_time_s": entry['end_time_s']
-                })
-        multilingual_captions[lang] = translated_captions
+    # Columnar: the text column is translated per language in one batch, then zipped back with the timings
+    texts = [entry['text'] for entry in original_captions]
+    timings = [(entry['start_time_s'], entry['end_time_s']) for entry in original_captions]
+
+    def _translate_one(lang: str) -> List[Dict[str, Any]]:
+        translated_texts = translate_texts(texts, lang, source_language_code="en") # Assuming original is English
+        return [
+            {"text": translated_text, "start_time_s": start_s, "end_time_s": end_s}
+            for translated_text, (start_s, end_s) in zip(translated_texts, timings)
+            if translated_text
+        ]
+
+    # Languages are independent; with the real API each batch is a network round trip, so they overlap in threads
+    if len(target_languages) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(_MAX_TRANSLATION_WORKERS, len(target_languages))) as executor:
+            multilingual_captions.update(zip(target_languages, executor.map(_translate_one, target_languages)))
+    else:
+        multilingual_captions.update((lang, _translate_one(lang)) for lang in target_languages)
     
     logger.info(f"Multilingual caption generation simulated for {len(target_languages)} languages.")
     return multilingual_captions
@@ -70,12 +111,9 @@ def detect_language(text: str) -> Optional[str]:
     logger.info(f"Simulating language detection for text: '{text[:50]}...'")
     # TODO: Integrate with a language detection API (e.g., Google Cloud Translation API's detect language).
     
-    # Simple dummy detection
-    if "hello" in text.lower() or "apple" in text.lower():
-        return "en"
-    elif "hola" in text.lower() or "manzana" in text.lower():
-        return "es"
-    elif "bonjour" in text.lower() or "pomme" in text.lower():
-        return "fr"
-    else:
-        return "unknown"
+    # Simple dummy detection: lowercase once, first language in priority order with a keyword wins
+    lowered = text.lower()
+    for lang, keywords in _DETECTION_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return lang
+    return "unknown"
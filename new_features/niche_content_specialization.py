@@ -1,22 +1,27 @@
 import logging
-from typing import Dict, Any, Optional, List
+import string
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping
 
 logger = logging.getLogger(__name__)
 
-def generate_niche_specific_script(niche_topic: str, persona: str, keywords: List[str]) -> Optional[str]:
-    """
-    Generates a script tailored to a specific niche and persona using LLMs.
-    This is a conceptual placeholder.
-    """
-    logger.info(f"Generating niche-specific script for '{niche_topic}' with persona '{persona}' and keywords: {keywords}")
-    # TODO: Leverage advanced prompt engineering with LLMs (e.g., Gemini) to
-    # infuse the script with the tone, vocabulary, and specific information relevant to the niche.
-    
-    script = f"""
-    [NICHE-SPECIFIC SCRIPT: {niche_topic.upper()}]
+# Read-only so the shared style entries can be returned directly without a copy per call
+_NICHE_STYLE_GUIDE = MappingProxyType({
+    "science_fiction": MappingProxyType({"aesthetic": "futuristic, neon, high-tech", "color_palette": "blues, purples, cyans"}),
+    "nature_documentary": MappingProxyType({"aesthetic": "lush, serene, natural light", "color_palette": "greens, browns, earth tones"}),
+    "cooking_show": MappingProxyType({"aesthetic": "bright, clean, appetizing", "color_palette": "warm yellows, reds, whites"}),
+    "default": MappingProxyType({"aesthetic": "clean, modern", "color_palette": "balanced"})
+})
+
+# Lowercases ASCII and turns spaces into underscores in one translate() pass; the style keys are plain ASCII
+_STYLE_KEY_TABLE = str.maketrans(string.ascii_uppercase + " ", string.ascii_lowercase + "_")
+
+# Filled with str.format per call; the keyword list is joined once before formatting
+_NICHE_SCRIPT_TEMPLATE = """
+    [NICHE-SPECIFIC SCRIPT: {niche_topic_upper}]
 
     As a {persona}, let's talk about {niche_topic}!
-    Keywords: {', '.join(keywords)}.
+    Keywords: {keywords}.
 
     This section would contain a script meticulously crafted by an advanced LLM
     to resonate with the target niche audience. It would use specialized terminology,
@@ -27,10 +32,21 @@ def generate_niche_specific_script(niche_topic: str, persona: str, keywords: Lis
 
     [END OF NICHE SCRIPT]
     """
+
+def generate_niche_specific_script(niche_topic: str, persona: str, keywords: List[str]) -> Optional[str]:
+    """
+    Generates a script tailored to a specific niche and persona using LLMs.
+    This is a conceptual placeholder.
+    """
+    logger.info(f"Generating niche-specific script for '{niche_topic}' with persona '{persona}' and keywords: {keywords}")
+    # TODO: Leverage advanced prompt engineering with LLMs (e.g., Gemini) to
+    # infuse the script with the tone, vocabulary, and specific information relevant to the niche.
+    
+    script = _NICHE_SCRIPT_TEMPLATE.format(niche_topic_upper=niche_topic.upper(), persona=persona, niche_topic=niche_topic, keywords=', '.join(keywords))
     logger.info("Niche-specific script generation simulated.")
     return script
 
-def select_niche_visual_style(niche_theme: str) -> Dict[str, Any]:
+def select_niche_visual_style(niche_theme: str) -> Mapping[str, Any]:
     """
     Selects a visual style optimized for a specific content niche.
     This is a conceptual placeholder for visual asset selection or AI style transfer parameters.
@@ -39,15 +55,8 @@ def select_niche_visual_style(niche_theme: str) -> Dict[str, Any]:
     # TODO: Logic to select appropriate stock footage categories, AI image generation styles,
     # color palettes, and perhaps apply filters or style transfer (e.g., calling dynamic_visual_cues.py).
 
-    style_guide = {
-        "science_fiction": {"aesthetic": "futuristic, neon, high-tech", "color_palette": "blues, purples, cyans"},
-        "nature_documentary": {"aesthetic": "lush, serene, natural light", "color_palette": "greens, browns, earth tones"},
-        "cooking_show": {"aesthetic": "bright, clean, appetizing", "color_palette": "warm yellows, reds, whites"},
-        "default": {"aesthetic": "clean, modern", "color_palette": "balanced"}
-    }
-    
-    chosen_style = style_guide.get(niche_theme.lower().replace(" ", "_"), style_guide["default"])
-    logger.info(f"Selected visual style: {chosen_style}")
+    chosen_style = _NICHE_STYLE_GUIDE.get(niche_theme.translate(_STYLE_KEY_TABLE), _NICHE_STYLE_GUIDE["default"])
+    logger.info(f"Selected visual style: {dict(chosen_style)}")
     return chosen_style
 
 def integrate_community_feedback(niche_community: str, content_draft: Dict[str, Any]) -> Dict[str, Any]:
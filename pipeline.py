@@ -2,7 +2,10 @@
 import logging
 import os
 import time
+import concurrent.futures
 import shutil
+from itertools import accumulate
+from types import MappingProxyType
 from typing import Optional, List, Tuple
 
 # Local imports
@@ -10,9 +13,10 @@ from config import GLOBAL_CONFIG
 from models import VideoParams, SubtitleEntry, SubtitleFont, SubtitlePosition, VideoAspect
 from utils.cleanup import cleanup_runtime_files, setup_runtime_directories
 from utils.gcs_utils import upload_to_gcs # Conceptual GCS upload, main output goes to Drive mount
+from utils.ffmpeg_utils import add_audio_to_video, add_audio_and_subtitles_to_video
 from utils.audio_utils import combine_audio_tracks, download_background_music, get_audio_duration_ffprobe # Corrected import
 from ai_integration.gemini_integration import generate_script_with_gemini
-from ai_integration.speech_synthesis import synthesize_narration # synthesize_narration is still from speech_synthesis
+from ai_integration.speech_synthesis import synthesize_narration, speculative_prewarm, prepend_intro_audio # synthesize_narration is still from speech_synthesis
 from media_processing.video_editor import download_source_clips, combine_and_edit_clips, generate_subtitles_file
 
 logger = logging.getLogger(__name__)
@@ -25,6 +29,12 @@ OUTPUT_DIR = os.path.join(RUNTIME_BASE_DIR, GLOBAL_CONFIG['paths']['output_dir']
 TEMP_FILES_DIR = os.path.join(RUNTIME_BASE_DIR, GLOBAL_CONFIG['paths']['temp_files_dir'])
 LOGS_DIR = os.path.join(RUNTIME_BASE_DIR, GLOBAL_CONFIG['paths']['logs_dir'])
 
+# Font files used when burning subtitles; resolved once at import instead of on every pipeline run
+_FONT_PATH_MAP = MappingProxyType({
+    SubtitleFont.ROBOTO: os.path.join(os.path.expanduser('~'), '.fonts', 'Roboto-Regular.ttf'),
+})
+_DEFAULT_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
 def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optional[str]]:
     logger.info("Starting video generation pipeline...")
     start_time = time.time()
@@ -34,8 +44,13 @@ def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optiona
     file_handler = logging.FileHandler(log_file_path)
     file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
     logging.getLogger().addHandler(file_handler)
-    logger.info(f"Pipeline log file: {log_file_path}")
+    logger.info("Pipeline log file: %s", log_file_path)
+
 
+    # Known intros/stingers don't depend on the script, so their audio is synthesized while Gemini is busy;
+    # Phase 3 narrates them ahead of the script
+    speculative_texts = GLOBAL_CONFIG['audio_settings'].get('speculative_texts', [])
+    prewarm_futures = speculative_prewarm(speculative_texts, params.speech_synthesis_voice, AUDIO_DIR) if speculative_texts else []
 
     final_video_output_path = None
     try:
@@ -49,7 +64,7 @@ def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optiona
         if not script_text:
             logger.error("Script generation failed. Aborting pipeline at Phase 2.")
             return None, log_file_path
-        logger.info(f"Generated Script (Phase 2 Complete). Script length: {len(script_text)} characters.")
+        logger.info("Generated Script (Phase 2 Complete). Script length: %d characters.", len(script_text))
 
         # 3. Narration Synthesis
         logger.info("Phase 3: Synthesizing narration...")
@@ -61,10 +76,20 @@ def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optiona
         if not narration_audio_path:
             logger.error("Narration synthesis failed. Aborting pipeline at Phase 3.")
             return None, log_file_path
+
+        intro_duration_s = 0.0 # Narration time before the script starts, for the subtitle timings
+        if prewarm_futures:
+            intro_paths = [future.result() for future in prewarm_futures] # Usually finished while the script was generated
+            with_intro_path = prepend_intro_audio(intro_paths, narration_audio_path) if all(intro_paths) else None
+            if with_intro_path:
+                intro_duration_s = sum(get_audio_duration_ffprobe(path) or 0.0 for path in intro_paths)
+                narration_audio_path = with_intro_path
+            else:
+                logger.warning("Intro narration snippets could not be synthesized or joined. Narrating the script without them.")
         
         # FIX: Corrected typo from 'naration_audio_path' to 'narration_audio_path'
         narration_duration = get_audio_duration_ffprobe(narration_audio_path) 
-        logger.info(f"Narration synthesized (Phase 3 Complete). Duration: {narration_duration:.2f}s. Path: {narration_audio_path}")
+        logger.info("Narration synthesized (Phase 3 Complete). Duration: %.2fs. Path: %s", narration_duration, narration_audio_path)
         
         if narration_duration is None:
             logger.warning("Could not determine narration duration. Setting target video duration to 60s.")
@@ -76,7 +101,7 @@ def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optiona
 
 
         # 4. Video Clip Sourcing/Generation
-        logger.info(f"Phase 4: Sourcing/generating video clips ({params.video_source_type})...")
+        logger.info("Phase 4: Sourcing/generating video clips (%s)...", params.video_source_type.value)
         downloaded_clips = download_source_clips(
             video_params=params,
             video_downloads_dir=VIDEO_DOWNLOADS_DIR,
@@ -85,7 +110,7 @@ def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optiona
         if not downloaded_clips:
             logger.error("No video clips sourced or generated. Aborting pipeline at Phase 4.")
             return None, log_file_path
-        logger.info(f"Sourced/generated {len(downloaded_clips)} clips (Phase 4 Complete). Paths: {downloaded_clips}")
+        logger.info("Sourced/generated %d clips (Phase 4 Complete). Paths: %s", len(downloaded_clips), downloaded_clips)
 
         # 5. Combine and Edit Video Clips
         logger.info("Phase 5: Combining and editing video clips...")
@@ -104,7 +129,7 @@ def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optiona
         if not combined_video_path:
             logger.error("Video combination/editing failed. Aborting pipeline at Phase 5.")
             return None, log_file_path
-        logger.info(f"Base video created (Phase 5 Complete): {combined_video_path}")
+        logger.info("Base video created (Phase 5 Complete): %s", combined_video_path)
 
         # 6. Background Music Integration
         logger.info("Phase 6: Downloading and integrating background music...")
@@ -128,44 +153,26 @@ def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optiona
                 logger.error("Failed to combine narration and background music. Aborting pipeline at Phase 6.")
                 return None, log_file_path
             final_audio_path = combined_audio_result
-        logger.info(f"Final audio track prepared (Phase 6 Complete): {final_audio_path}")
-
-        # Add final audio to combined video
-        video_with_audio_path = os.path.join(TEMP_FILES_DIR, f"{base_video_name}_with_audio.mp4")
-        audio_added_result = add_audio_to_video(
-            video_path=combined_video_path,
-            audio_path=final_audio_path,
-            output_path=video_with_audio_path
-        )
-        if not audio_added_result:
-            logger.error("Failed to add audio to video. Aborting pipeline at Phase 6.")
-            return None, log_file_path
-        final_video_output_path = video_with_audio_path
-        logger.info(f"Video with audio created (Phase 6 Complete): {final_video_output_path}")
+        logger.info("Final audio track prepared (Phase 6 Complete): %s", final_audio_path)
 
         # 7. Subtitle Generation and Burning
+        # The ASS file is written first so burning it and muxing the final audio happen in one ffmpeg pass
+        ass_file_created = None
         if params.enable_subtitles:
             logger.info("Phase 7: Generating and burning subtitles...")
-            dummy_subtitle_entries: List[SubtitleEntry] = []
             words = script_text.split()
-            word_duration = narration_duration / len(words) if narration_duration else 0.5
-            current_time = 0.0
+            word_duration = (narration_duration - intro_duration_s) / len(words) if narration_duration else 0.5
             segment_length = 5
-            for i in range(0, len(words), segment_length):
-                segment_words = words[i:i+segment_length]
-                segment_text = " ".join(segment_words)
-                start_s = current_time
-                end_s = current_time + (len(segment_words) * word_duration)
-                dummy_subtitle_entries.append(SubtitleEntry(text=segment_text, start_time_s=start_s, end_time_s=end_s))
-                current_time = end_s
+            # Segment end times are a running sum of (words in segment * word_duration) from the end of the intro;
+            # each start is the previous end
+            segment_starts = range(0, len(words), segment_length)
+            segment_ends_s = list(accumulate((min(segment_length, len(words) - i) * word_duration for i in segment_starts), initial=intro_duration_s))[1:]
+            dummy_subtitle_entries: List[SubtitleEntry] = [
+                SubtitleEntry(text=" ".join(words[i:i + segment_length]), start_time_s=start_s, end_time_s=end_s)
+                for i, start_s, end_s in zip(segment_starts, [intro_duration_s, *segment_ends_s], segment_ends_s)
+            ]
 
             subtitle_file_path = os.path.join(TEMP_FILES_DIR, f"{base_video_name}_subtitles.ass")
-            font_path_map = {
-                SubtitleFont.ROBOTO: os.path.join(os.path.expanduser('~'), '.fonts', 'Roboto-Regular.ttf'),
-            }
-            default_font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
-            chosen_font_path = font_path_map.get(params.subtitle_font, default_font_path)
-
             ass_file_created = generate_subtitles_file(
                 subtitle_entries=dummy_subtitle_entries,
                 output_filepath=subtitle_file_path,
@@ -176,30 +183,37 @@ def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optiona
                 outline_width=params.subtitle_outline_width,
                 position=params.subtitle_position
             )
-
-            if ass_file_created:
-                video_with_subtitles_path = os.path.join(OUTPUT_DIR, f"{base_video_name}_final.mp4")
-                subtitles_burnt = add_subtitles_to_video(
-                    video_path=final_video_output_path,
-                    subtitle_file_path=ass_file_created,
-                    output_path=video_with_subtitles_path,
-                    font_path=chosen_font_path,
-                    font_size=params.subtitle_font_size,
-                    font_color=params.subtitle_color,
-                    outline_color=params.subtitle_outline_color,
-                    outline_width=params.subtitle_outline_width,
-                    position=params.subtitle_position.to_ffmpeg_ass_position()
-                )
-                if subtitles_burnt:
-                    final_video_output_path = video_with_subtitles_path
-                else:
-                    logger.error("Failed to burn subtitles. Final video will be without subtitles at Phase 7.")
-            else:
+            if not ass_file_created:
                 logger.warning("Failed to generate subtitle ASS file. Skipping subtitle burning at Phase 7.")
         else:
             logger.info("Subtitles disabled as per parameters.")
 
-        logger.info(f"Final video generated (Phase 7 Complete): {final_video_output_path}")
+        final_video_output_path = None
+        if ass_file_created:
+            final_video_output_path = add_audio_and_subtitles_to_video(
+                video_path=combined_video_path,
+                audio_path=final_audio_path,
+                subtitle_file_path=ass_file_created,
+                output_path=os.path.join(OUTPUT_DIR, f"{base_video_name}_final.mp4"),
+                font_path=_FONT_PATH_MAP.get(params.subtitle_font, _DEFAULT_FONT_PATH)
+            )
+            if not final_video_output_path:
+                logger.error("Failed to burn subtitles. Final video will be without subtitles at Phase 7.")
+
+        if not final_video_output_path:
+            # Add final audio to combined video (stream copy of the video)
+            video_with_audio_path = os.path.join(TEMP_FILES_DIR, f"{base_video_name}_with_audio.mp4")
+            audio_added_result = add_audio_to_video(
+                video_path=combined_video_path,
+                audio_path=final_audio_path,
+                output_path=video_with_audio_path
+            )
+            if not audio_added_result:
+                logger.error("Failed to add audio to video. Aborting pipeline at Phase 7.")
+                return None, log_file_path
+            final_video_output_path = video_with_audio_path
+
+        logger.info("Final video generated (Phase 7 Complete): %s", final_video_output_path)
 
         # 8. Upload to Google Drive
         logger.info("Phase 8: Copying final video and log to Google Drive...")
@@ -208,27 +222,32 @@ def generate_video_pipeline(params: VideoParams) -> Tuple[Optional[str], Optiona
             os.makedirs(os.path.dirname(drive_output_path), exist_ok=True)
             
             try:
-                shutil.copy(final_video_output_path, drive_output_path)
-                logger.info(f"Final video copied to Google Drive: {drive_output_path}")
+                # copyfile skips the mode-bit copy and uses the kernel's sendfile fast path on Linux
+                shutil.copyfile(final_video_output_path, drive_output_path)
+                logger.info("Final video copied to Google Drive: %s", drive_output_path)
                 drive_log_path = os.path.join(PROJECT_ROOT_DIR, 'logs', os.path.basename(log_file_path))
                 os.makedirs(os.path.dirname(drive_log_path), exist_ok=True)
-                shutil.copy(log_file_path, drive_log_path)
-                logger.info(f"Log file copied to Google Drive: {drive_log_path}")
+                shutil.copyfile(log_file_path, drive_log_path)
+                logger.info("Log file copied to Google Drive: %s", drive_log_path)
             except Exception as e:
-                logger.error(f"Failed to copy final video or log to Google Drive: {e}", exc_info=True)
+                logger.error("Failed to copy final video or log to Google Drive: %s", e, exc_info=True)
             logger.info("Output copy to Google Drive attempted (Phase 8 Complete).")
         else:
-            logger.error(f"Final video output path is invalid or file does not exist: {final_video_output_path}. Skipping copy to Google Drive.")
+            logger.error("Final video output path is invalid or file does not exist: %s. Skipping copy to Google Drive.", final_video_output_path)
             
         end_time = time.time()
-        logger.info(f"Pipeline completed in {end_time - start_time:.2f} seconds.")
+        logger.info("Pipeline completed in %.2f seconds.", end_time - start_time)
 
         return final_video_output_path, log_file_path
 
     except Exception as e:
-        logger.critical(f"An unhandled error occurred in the pipeline: {e}", exc_info=True)
+        logger.critical("An unhandled error occurred in the pipeline: %s", e, exc_info=True)
         return None, log_file_path
     finally:
+        # Prewarm workers write into AUDIO_DIR: drop queued ones and let a running one finish before it is deleted
+        for future in prewarm_futures:
+            future.cancel()
+        concurrent.futures.wait(prewarm_futures)
         logger.info("Cleaning up runtime files...")
         cleanup_runtime_files()
         if file_handler in logging.getLogger().handlers:
@@ -1,5 +1,5 @@
 # Cell (X): ui_pipeline.py (FIXED: Enable Gradio Queue)
-import gradio as gr
+import asyncio
 import logging
 import os
 import shutil
@@ -14,7 +14,20 @@ logger = logging.getLogger(__name__)
 if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def run_pipeline_ui(
+# Dropdown choices are fixed by the enums, so build them once at import rather than on every UI launch
+_LANGUAGE_CHOICES = [e.value for e in VideoLanguage]
+_VOICE_CHOICES = [e.value for e in SpeechSynthesisVoice]
+_SOURCE_TYPE_CHOICES = [e.value for e in VideoSourceType]
+_ASPECT_CHOICES = [e.value for e in VideoAspect]
+_CONCAT_MODE_CHOICES = [e.value for e in VideoConcatMode]
+_TRANSITION_MODE_CHOICES = [e.value for e in VideoTransitionMode]
+_FONT_CHOICES = [e.value for e in SubtitleFont]
+_POSITION_CHOICES = [e.value for e in SubtitlePosition]
+
+_PIPELINE_CONCURRENCY = 1 # Concurrent pipeline runs; each one saturates ffmpeg/the GPU encoder
+_QUEUE_MAX_SIZE = 20 # Further clicks are rejected instead of piling up
+
+async def run_pipeline_ui(
     video_subject: str,
     video_language: str,
     video_source_type: str,
@@ -36,6 +49,7 @@ def run_pipeline_ui(
 ):
     """
     Wrapper function to run the video generation pipeline from Gradio UI.
+    An async generator: the blocking pipeline runs in a worker thread, so the event loop stays free to serve other requests.
     """
     print("DEBUG: run_pipeline_ui HAS BEEN CALLED!") # CRITICAL DEBUG PRINT
     logger.info("Gradio UI: Video generation started.") 
@@ -62,25 +76,27 @@ def run_pipeline_ui(
             subtitle_outline_width=subtitle_outline_width
         )
     except ValueError as e:
-        logger.error(f"Gradio UI: Invalid input parameter: {e}")
-        return None, None, f"Error: Invalid input parameter: {e}. Please check your selections."
+        logger.error("Gradio UI: Invalid input parameter: %s", e)
+        yield None, None, f"Error: Invalid input parameter: {e}. Please check your selections."
+        return
 
     # Initial status update for the UI
     yield None, None, "Video generation in progress... Please wait." # Yield to update UI immediately
 
-    final_video_path, log_path = generate_video_pipeline(params)
+    final_video_path, log_path = await asyncio.to_thread(generate_video_pipeline, params)
 
     if final_video_path and os.path.exists(final_video_path):
         final_status = f"Video generation completed successfully! Output: {final_video_path}"
         logger.info(final_status)
-        return final_video_path, log_path, final_status
+        yield final_video_path, log_path, final_status
     else:
         final_status = f"Video generation failed. Check log file for errors: {log_path}"
         logger.error(final_status)
-        return None, log_path, final_status
+        yield None, log_path, final_status
 
 def launch_gradio_ui():
     """Launches the Gradio user interface."""
+    import gradio as gr # Imported here so using run_pipeline_ui alone doesn't pay Gradio's import cost
     logger.info("Launching Gradio UI...")
 
     # Determine default values from GLOBAL_CONFIG
@@ -110,13 +126,13 @@ def launch_gradio_ui():
                 video_subject = gr.Textbox(label="Video Subject/Topic", placeholder="e.g., 'Benefits of AI in daily life'", interactive=True)
                 video_language = gr.Dropdown(
                     label="Video Language",
-                    choices=[e.value for e in VideoLanguage],
+                    choices=_LANGUAGE_CHOICES,
                     value=default_video_params.video_language.value,
                     interactive=True
                 )
                 speech_synthesis_voice = gr.Dropdown(
                     label="Narration Voice",
-                    choices=[e.value for e in SpeechSynthesisVoice],
+                    choices=_VOICE_CHOICES,
                     value=default_video_params.speech_synthesis_voice.value,
                     interactive=True
                 )
@@ -124,7 +140,7 @@ def launch_gradio_ui():
                 gr.Markdown("### 🎥 Video Source & Editing")
                 video_source_type = gr.Dropdown(
                     label="Video Source Type",
-                    choices=[e.value for e in VideoSourceType],
+                    choices=_SOURCE_TYPE_CHOICES,
                     value=default_video_params.video_source_type.value,
                     interactive=True
                 )
@@ -136,19 +152,19 @@ def launch_gradio_ui():
                 )
                 video_aspect_ratio = gr.Radio(
                     label="Video Aspect Ratio",
-                    choices=[e.value for e in VideoAspect],
+                    choices=_ASPECT_CHOICES,
                     value=default_video_params.video_aspect_ratio.value,
                     interactive=True
                 )
                 video_concat_mode = gr.Dropdown(
                     label="Video Concatenation Mode",
-                    choices=[e.value for e in VideoConcatMode],
+                    choices=_CONCAT_MODE_CHOICES,
                     value=default_video_params.video_concat_mode.value,
                     interactive=True
                 )
                 video_transition_mode = gr.Dropdown(
                     label="Video Transition Mode",
-                    choices=[e.value for e in VideoTransitionMode],
+                    choices=_TRANSITION_MODE_CHOICES,
                     value=default_video_params.video_transition_mode.value,
                     interactive=True
                 )
@@ -161,13 +177,13 @@ def launch_gradio_ui():
                 enable_subtitles = gr.Checkbox(label="Enable Subtitles", value=default_video_params.enable_subtitles, interactive=True)
                 subtitle_font = gr.Dropdown(
                     label="Font",
-                    choices=[e.value for e in SubtitleFont],
+                    choices=_FONT_CHOICES,
                     value=default_video_params.subtitle_font.value,
                     interactive=True
                 )
                 subtitle_position = gr.Dropdown(
                     label="Position",
-                    choices=[e.value for e in SubtitlePosition],
+                    choices=_POSITION_CHOICES,
                     value=default_video_params.subtitle_position.value,
                     interactive=True
                 )
@@ -208,11 +224,13 @@ def launch_gradio_ui():
                 subtitle_outline_color,
                 subtitle_outline_width
             ],
-            outputs=[video_output, log_output, status_text]
+            outputs=[video_output, log_output, status_text],
+            concurrency_limit=_PIPELINE_CONCURRENCY, # One render at a time; the encoder is the bottleneck
+            api_name=False # No REST endpoint, so requests can't bypass the queue
         )
         
         # --- FIX: Enable Gradio Queue for generator functions ---
-        demo.queue(api_open=False).launch(debug=True, share=True) # api_open=False for security in public demos
+        demo.queue(api_open=False, max_size=_QUEUE_MAX_SIZE).launch(debug=True, share=True) # api_open=False for security in public demos
 
 if __name__ == "__main__":
     launch_gradio_ui()
\ No newline at end of file
@@ -1,6 +1,5 @@
 import logging
 import os
-import shlex
 import requests
 import uuid
 import time
@@ -11,6 +10,9 @@ from config import GLOBAL_CONFIG # For API keys if needed for background music s
 
 logger = logging.getLogger(__name__)
 
+# Static ffprobe argv prefix; each call only appends the input path.
+_FFPROBE_DURATION_ARGS = ('ffprobe', '-v', 'error', '-probesize', '500K', '-analyzeduration', '0', '-show_entries', 'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1')
+
 def get_audio_duration_ffprobe(audio_path: str) -> Optional[float]:
     """
     Gets the duration of an audio file using ffprobe.
@@ -19,7 +21,7 @@ def get_audio_duration_ffprobe(audio_path: str) -> Optional[float]:
         logger.warning(f"Audio file not found for duration check: {audio_path}")
         return None
 
-    cmd = ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1', shlex.quote(audio_path)]
+    cmd = [*_FFPROBE_DURATION_ARGS, audio_path]
     stdout, stderr, returncode = run_shell_command(cmd, check_error=False)
 
     if returncode != 0:
@@ -58,8 +60,8 @@ def combine_audio_tracks(
 
     cmd = [
         'ffmpeg', '-y',
-        '-i', shlex.quote(track1_path),
-        '-i', shlex.quote(track2_path),
+        '-i', track1_path,
+        '-i', track2_path,
         '-filter_complex', filter_complex,
         '-map', '[aout]',
         '-c:a', 'aac',
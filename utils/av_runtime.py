@@ -0,0 +1,101 @@
+import logging
+from typing import List, Tuple
+
+# PyAV links libavformat/libavfilter in-process; without it callers fall back to the ffmpeg CLI
+try:
+    import av
+    HAS_PYAV = True
+except ImportError:
+    HAS_PYAV = False
+
+logger = logging.getLogger(__name__)
+
+def _get_token(text: str, pos: int, terminators: str) -> Tuple[str, int]:
+    """
+    Mirrors libavutil's av_get_token: reads up to an unquoted terminator, dropping one level of
+    '...' quoting and backslash escaping. Returns the token and the index of the terminator.
+    """
+    out: List[str] = []
+    while pos < len(text) and text[pos] not in terminators:
+        char = text[pos]
+        pos += 1
+        if char == '\\' and pos < len(text):
+            out.append(text[pos])
+            pos += 1
+        elif char == "'":
+            closing = text.find("'", pos)
+            closing = len(text) if closing == -1 else closing
+            out.append(text[pos:closing])
+            pos = closing + 1
+        else:
+            out.append(char)
+    return ''.join(out).strip(), pos
+
+def parse_filter_chain(chain: str) -> List[Tuple[str, str]]:
+    """
+    Splits a linear -vf chain like "scale=1080:1920,crop=1080:1920" into (name, args) pairs,
+    unescaping the arguments the way ffmpeg's graph parser does before handing them to each filter.
+    """
+    filters: List[Tuple[str, str]] = []
+    pos = 0
+    while pos < len(chain):
+        name, pos = _get_token(chain, pos, '=,')
+        args = ''
+        if pos < len(chain) and chain[pos] == '=':
+            args, pos = _get_token(chain, pos + 1, ',')
+        filters.append((name, args))
+        pos += 1 # Skip the ','
+    return filters
+
+def filter_video(input_path: str, output_path: str, video_filter: str, crf: int = 23, preset: str = 'fast') -> None:
+    """
+    In-process equivalent of `ffmpeg -i input -vf video_filter -c:v libx264 -preset P -crf C -pix_fmt yuv420p -c:a copy`:
+    video frames go through a libavfilter graph and are encoded to H.264, the first audio stream is copied.
+    Raises av.error.FFmpegError (or ValueError for an unusable filter) on failure.
+    """
+    with av.open(input_path) as source, av.open(output_path, 'w') as target:
+        in_video = source.streams.video[0]
+        in_audio = source.streams.audio[0] if source.streams.audio else None
+
+        graph = av.filter.Graph()
+        nodes = [graph.add_buffer(template=in_video)]
+        nodes.extend(graph.add(name, args) for name, args in parse_filter_chain(video_filter))
+        nodes.append(graph.add('buffersink'))
+        graph.link_nodes(*nodes).configure()
+
+        out_video = target.add_stream('libx264', rate=in_video.average_rate or 30, options={'crf': str(crf), 'preset': preset})
+        out_video.pix_fmt = 'yuv420p'
+        out_audio = target.add_stream_from_template(in_audio) if in_audio is not None else None
+
+        # The output size is only known once the graph has produced a frame, and nothing can be muxed
+        # before it is set, so audio read ahead of the first video frame waits here
+        pending_audio = []
+        sized = False
+
+        def encode_filtered() -> None:
+            nonlocal sized
+            while True:
+                try:
+                    frame = graph.vpull()
+                except (BlockingIOError, av.error.EOFError):
+                    return
+                if not sized:
+                    out_video.width, out_video.height = frame.width, frame.height
+                    sized = True
+                target.mux(out_video.encode(frame.reformat(format='yuv420p')))
+                while pending_audio:
+                    target.mux(pending_audio.pop(0))
+
+        for packet in source.demux([s for s in (in_video, in_audio) if s is not None]):
+            if packet.stream is in_audio:
+                if packet.dts is not None:
+                    packet.stream = out_audio
+                    (target.mux if sized else pending_audio.append)(packet)
+                continue
+            for frame in packet.decode():
+                graph.vpush(frame)
+                encode_filtered()
+
+        graph.vpush(None) # Flush the filters, then the encoder
+        encode_filtered()
+        target.mux(out_video.encode(None))
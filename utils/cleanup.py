@@ -36,23 +36,26 @@ def cleanup_runtime_files():
     logger.info(f"Initiating cleanup of temporary runtime files under: {RUNTIME_BASE_DIR}")
     try:
         if os.path.exists(RUNTIME_BASE_DIR):
-            # Iterate and remove contents, then remove the base directory itself
-            for item in os.listdir(RUNTIME_BASE_DIR):
-                item_path = os.path.join(RUNTIME_BASE_DIR, item)
-                if os.path.isdir(item_path):
-                    shutil.rmtree(item_path)
-                    logger.info(f"Cleaned up temporary directory: {item_path}")
-                else:
-                    os.remove(item_path)
-                    logger.info(f"Cleaned up temporary file: {item_path}")
+            # scandir's DirEntry carries the file type from the directory read, so no extra stat per entry
+            with os.scandir(RUNTIME_BASE_DIR) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                        logger.info(f"Cleaned up temporary directory: {entry.path}")
+                    else:
+                        os.unlink(entry.path)
+                        logger.info(f"Cleaned up temporary file: {entry.path}")
 
-            # After removing all contents, remove the base directory
-            if not os.listdir(RUNTIME_BASE_DIR): # Check if it's empty before removing
+            # After removing all contents, remove the base directory (rmdir itself refuses a non-empty one)
+            try:
                 os.rmdir(RUNTIME_BASE_DIR)
                 logger.info(f"Removed empty base runtime directory: {RUNTIME_BASE_DIR}")
-            else:
+            except OSError:
                 logger.warning(f"Runtime base directory {RUNTIME_BASE_DIR} is not empty after cleanup attempt.")
 
+        # Directories were removed, so the video helpers must create them again on next use
+        from utils.video_utils import reset_ensured_dirs
+        reset_ensured_dirs()
 
         logger.info("Temporary file cleanup complete.")
     except Exception as e:
@@ -1,38 +1,107 @@
 import logging
 import subprocess
 import os
-import shlex
+import re
 import math
 import random
 from typing import List, Tuple, Optional, Any
 import shutil
+from functools import lru_cache
 
 from utils.shell_utils import run_shell_command
-from utils.video_utils import get_video_duration # Assuming get_video_duration is in video_utils
+from utils.video_utils import get_video_duration, get_video_resolution, probe_many # Assuming get_video_duration is in video_utils
 
 logger = logging.getLogger(__name__)
 
+# Encoder arguments keyed by ffmpeg encoder name, in order of preference.
+# h264_vaapi is left out: it needs a hwupload filter stage that the software scale/subtitles filters here don't have.
+_H264_ENCODER_ARGS = {
+    'h264_nvenc': ['-c:v', 'h264_nvenc', '-preset', 'p4', '-cq', '23'],
+    'h264_qsv': ['-c:v', 'h264_qsv', '-preset', 'medium', '-global_quality', '23'],
+    'libx264': ['-c:v', 'libx264', '-preset', 'fast', '-crf', '23'],
+}
+
+@lru_cache(maxsize=None)
+def _detect_h264_encoder() -> str:
+    """
+    Lists the ffmpeg build's encoders once per process and returns the first available hardware H.264 encoder,
+    or libx264.
+    """
+    stdout, stderr, returncode = run_shell_command(['ffmpeg', '-hide_banner', '-encoders'], check_error=False, timeout=10)
+    encoders = stdout.split() if returncode == 0 else []
+    encoder = next((name for name in _H264_ENCODER_ARGS if name in encoders), 'libx264')
+    logger.info(f"Using H.264 encoder: {encoder}")
+    return encoder
+
+def _video_encoder_args(encoder: Optional[str] = None) -> List[str]:
+    """Returns the -c:v/quality arguments for the given (default: detected) H.264 encoder."""
+    return list(_H264_ENCODER_ARGS[encoder or _detect_h264_encoder()])
+
+def _run_encode(build_cmd, timeout: int) -> Tuple[str, str, int]:
+    """
+    Runs the ffmpeg command produced by build_cmd(encoder_args) with the detected encoder.
+    Being listed by -encoders doesn't guarantee a usable GPU/driver, so a failed hardware encode is retried with libx264.
+    """
+    encoder = _detect_h264_encoder()
+    stdout, stderr, returncode = run_shell_command(build_cmd(_video_encoder_args(encoder)), check_error=False, timeout=timeout)
+    if returncode != 0 and encoder != 'libx264':
+        logger.warning(f"{encoder} encode failed, retrying with libx264: {stderr}")
+        stdout, stderr, returncode = run_shell_command(build_cmd(_video_encoder_args('libx264')), check_error=False, timeout=timeout)
+    return stdout, stderr, returncode
+
 def get_video_dimensions(video_path: str) -> Optional[Tuple[int, int]]:
     """
     Gets the width and height of a video file using ffprobe.
+    Delegates to video_utils.get_video_resolution so both share one cached probe per file.
     """
-    cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
-           '-show_entries', 'stream=width,height', '-of', 'csv=p=0:s=x',
-           shlex.quote(video_path)]
-
-    stdout, stderr, returncode = run_shell_command(cmd, check_error=False)
+    return get_video_resolution(video_path)
 
-    if returncode != 0:
-        logger.warning(f"ffprobe failed to get dimensions for {video_path}: {stderr}")
+def _first_stream(probe: Optional[dict], codec_type: str) -> Optional[dict]:
+    """Returns the probed file's first stream of codec_type ('video' or 'audio'), or None."""
+    if not probe:
         return None
+    return next((st for st in probe.get('streams', []) if st.get('codec_type') == codec_type), None)
 
-    try:
-        dimensions_str = stdout.strip()
-        width, height = map(int, dimensions_str.split('x'))
-        return width, height
-    except ValueError:
-        logger.warning(f"Could not parse dimensions from ffprobe output for {video_path}: {stdout}")
+def _concat_signature(probe: Optional[dict], target_width: int, target_height: int) -> Optional[tuple]:
+    """
+    Returns the stream parameters that must be identical across clips for the concat demuxer to stream-copy them:
+    frame rate, time base, H.264 profile and level, and the audio stream's codec, sample rate and channels
+    (None when there is no audio). Returns None if the first video stream isn't H.264 yuv420p at the target size.
+    """
+    video = _first_stream(probe, 'video')
+    if (
+        video is None
+        or video.get('codec_name') != 'h264'
+        or video.get('pix_fmt') != 'yuv420p'
+        or (video.get('width'), video.get('height')) != (target_width, target_height)
+    ):
+        return None
+    video_params = (video.get('avg_frame_rate'), video.get('time_base'), video.get('profile'), video.get('level'))
+    if None in video_params: # Not reported by this probe backend, so the clips can't be shown to match
         return None
+    audio = _first_stream(probe, 'audio')
+    return (*video_params, (audio.get('codec_name'), audio.get('sample_rate'), audio.get('channels')) if audio else None)
+
+def _filter_existing_paths(paths: List[str]) -> List[str]:
+    """
+    Returns the paths that exist, in order, listing each parent directory once with os.scandir
+    instead of issuing one stat per path (clips usually share a single download directory).
+    """
+    names_by_dir: dict = {}
+    existing = []
+    for path in paths:
+        parent, name = os.path.split(path)
+        names = names_by_dir.get(parent)
+        if names is None:
+            try:
+                with os.scandir(parent or '.') as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                names = set()
+            names_by_dir[parent] = names
+        if name in names:
+            existing.append(path)
+    return existing
 
 def concatenate_videos(
     video_paths: List[str],
@@ -42,8 +111,7 @@ def concatenate_videos(
     target_duration: float,
     transition: str = 'fade',
     transition_duration: float = 0.5,
-    randomize_order: bool = False,
-    temp_files_dir: str = '/tmp/tiktok_project_runtime/temp_files'
+    randomize_order: bool = False
 ) -> Optional[str]:
     """
     Concatenates multiple video clips into a single video with optional transitions.
@@ -55,11 +123,8 @@ def concatenate_videos(
         logger.error("No video paths provided for concatenation.")
         return None
 
-    # Ensure temp directory exists
-    os.makedirs(temp_files_dir, exist_ok=True)
-
     # Filter out non-existent paths
-    existing_video_paths = [p for p in video_paths if os.path.exists(p)]
+    existing_video_paths = _filter_existing_paths(video_paths)
     if len(existing_video_paths) != len(video_paths):
         logger.warning(f"Skipped {len(video_paths) - len(existing_video_paths)} non-existent video paths.")
     if not existing_video_paths:
@@ -70,125 +135,125 @@ def concatenate_videos(
         random.shuffle(existing_video_paths)
         logger.info("Video order randomized.")
 
-    # Create a list of scaled/cropped temporary video paths
-    temp_scaled_videos = []
-    current_total_duration = 0.0
-
-    for i, video_path in enumerate(existing_video_paths):
-        temp_output_path = os.path.join(temp_files_dir, f"scaled_clip_{i}.mp4")
-        
-        # Simple scaling to fit width, then pad/crop height
-        scale_filter = f"scale='min({target_width},iw)':'min({target_height},ih)':force_original_aspect_ratio=decrease,pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2"
-        
-        cmd = [
-            'ffmpeg', '-y',
-            '-i', shlex.quote(video_path),
-            '-vf', scale_filter,
-            '-c:v', 'libx264',
-            '-preset', 'fast',
-            '-crf', '23',
-            '-pix_fmt', 'yuv420p',
-            temp_output_path
-        ]
-        stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=180)
-        if returncode != 0:
-            logger.error(f"Failed to scale/crop video {video_path}: {stderr}")
-            continue
-        temp_scaled_videos.append(temp_output_path)
-        current_total_duration += get_video_duration(temp_output_path) or 0.0
-
-    if not temp_scaled_videos:
-        logger.error("No videos successfully scaled for concatenation.")
-        return None
+    input_probes = probe_many(existing_video_paths)
+    current_total_duration = sum(get_video_duration(clip) or 0.0 for clip in existing_video_paths)
 
     # Handle duration mismatch: loop last video if total duration is less than target
-    final_clips_for_concat = list(temp_scaled_videos) # Copy the list
+    last_clip_path = existing_video_paths[-1]
+    last_clip_duration = get_video_duration(last_clip_path) or 0.0
+    remaining_duration = 0.0
+    num_loops = 0
     if current_total_duration < target_duration:
-        last_clip_path = final_clips_for_concat[-1]
-        remaining_duration = target_duration - current_total_duration
-        logger.info(f"Total clip duration ({current_total_duration:.2f}s) is less than target ({target_duration:.2f}s). Looping last clip for {remaining_duration:.2f}s.")
-
-        # Create a looped version of the last clip
-        temp_looped_clip_path = os.path.join(temp_files_dir, "looped_last_clip.mp4")
-        
-        # Calculate how many times the last clip needs to loop
-        last_clip_duration = get_video_duration(last_clip_path)
-        if last_clip_duration and last_clip_duration > 0:
+        if last_clip_duration > 0:
+            remaining_duration = target_duration - current_total_duration
             num_loops = math.ceil(remaining_duration / last_clip_duration)
-            
-            # Use stream_loop for looping
-            loop_cmd = [
-                'ffmpeg', '-y',
-                '-stream_loop', str(num_loops -1),
-                '-i', shlex.quote(last_clip_path),
-                '-c', 'copy',
-                '-t', str(remaining_duration), # Trim to exact remaining duration
-                temp_looped_clip_path
-            ]
-            stdout, stderr, returncode = run_shell_command(loop_cmd, check_error=False, timeout=180)
-            if returncode == 0 and os.path.exists(temp_looped_clip_path):
-                final_clips_for_concat.append(temp_looped_clip_path)
-                logger.info(f"Looped last clip and added to concatenation list.")
-            else:
-                logger.warning(f"Failed to loop last clip: {stderr}. Proceeding without looping.")
+            logger.info(f"Total clip duration ({current_total_duration:.2f}s) is less than target ({target_duration:.2f}s). Looping last clip for {remaining_duration:.2f}s.")
         else:
             logger.warning("Last clip duration is zero or invalid, cannot loop.")
 
+    if transition != 'none':
+        logger.warning(f"Complex transitions like '{transition}' are not fully implemented via raw FFmpeg concat_videos. Using simple concat.")
 
-    # Create a concat list file
-    concat_list_path = os.path.join(temp_files_dir, "concat_list.txt")
-    with open(concat_list_path, 'w') as f:
-        for clip in final_clips_for_concat:
-            f.write(f"file '{clip}'\n")
-
-    # FFmpeg concatenation command
-    if transition == 'none':
-        concat_cmd = [
-            'ffmpeg', '-y',
-            '-f', 'concat',
-            '-safe', '0', # Allows absolute paths
-            '-i', concat_list_path,
-            '-c', 'copy',
-            output_path
-        ]
+    # Every clip already H.264/yuv420p at the target size with identical stream parameters: the concat demuxer
+    # can stream-copy without decoding (it doesn't fail on mismatched inputs, so they are checked up front)
+    signatures = {_concat_signature(input_probes.get(p), target_width, target_height) for p in existing_video_paths}
+    if len(signatures) == 1 and None not in signatures:
+        if _concat_stream_copy(existing_video_paths, output_path, remaining_duration, num_loops, last_clip_duration):
+            logger.info(f"Videos concatenated successfully (stream copy). Output: {output_path}.")
+            return output_path
+        logger.warning("Stream-copy concatenation failed, re-encoding instead.")
+
+    # One ffmpeg process: every input is scaled/padded inside the filter graph and fed straight into the concat filter,
+    # so there are no intermediate per-clip files and only a single encode
+    input_args = []
+    for video_path in existing_video_paths:
+        input_args += ['-i', video_path]
+    if num_loops:
+        input_args += ['-stream_loop', str(num_loops - 1), '-t', f"{remaining_duration:.3f}", '-i', last_clip_path]
+    input_clips = existing_video_paths + ([last_clip_path] if num_loops else [])
+    num_inputs = len(input_clips)
+
+    scale_filter = f"scale='min({target_width},iw)':'min({target_height},ih)':force_original_aspect_ratio=decrease,pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+    filters = [f"[{i}:v:0]{scale_filter}[v{i}]" for i in range(num_inputs)]
+
+    # Audio is kept whenever any clip has it: every segment is converted to the first audio stream's rate in
+    # stereo, and clips without audio get that much silence so the concat segments stay aligned
+    audio_streams = [_first_stream(input_probes.get(clip), 'audio') for clip in input_clips]
+    has_audio = any(audio_streams)
+    if has_audio:
+        sample_rate = next((int(audio['sample_rate']) for audio in audio_streams if audio and audio.get('sample_rate')), 44100)
+        audio_format = f"aformat=sample_fmts=fltp:sample_rates={sample_rate}:channel_layouts=stereo"
+        for i, (clip, audio) in enumerate(zip(input_clips, audio_streams)):
+            if audio:
+                filters.append(f"[{i}:a:0]{audio_format}[a{i}]")
+            else:
+                clip_duration = remaining_duration if num_loops and i == num_inputs - 1 else get_video_duration(clip) or 0.0
+                filters.append(f"anullsrc=r={sample_rate}:cl=stereo,atrim=duration={max(clip_duration, 0.001):.3f},{audio_format}[a{i}]")
+        segments = ''.join(f"[v{i}][a{i}]" for i in range(num_inputs))
+        filters.append(f"{segments}concat=n={num_inputs}:v=1:a=1[outv][outa]")
     else:
-        # Complex filtergraph for transitions (simplified for example)
-        # This part would need significant expansion for real transitions.
-        # For 'fade' and 'crossfade', moviepy's concatenate_videoclips handles it better.
-        # FFmpeg filtergraph for crossfade:
-        # [0:v][1:v]xfade=transition=fade:duration=1:offset=9[v]
-        # For simplicity, we'll use basic concatenation and log a warning for complex transitions.
-        logger.warning(f"Complex transitions like '{transition}' are not fully implemented via raw FFmpeg concat_videos. Using simple concat.")
-        concat_cmd = [
-            'ffmpeg', '-y',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', concat_list_path,
-            '-c:v', 'libx264',
-            '-preset', 'fast',
-            '-crf', '23',
-            '-pix_fmt', 'yuv420p',
-            output_path
-        ]
+        filters.append(''.join(f"[v{i}]" for i in range(num_inputs)) + f"concat=n={num_inputs}:v=1:a=0[outv]")
+    filter_complex = ';'.join(filters)
+    audio_args = ['-map', '[outa]', '-c:a', 'aac', '-b:a', '192k'] if has_audio else []
 
-    stdout, stderr, returncode = run_shell_command(concat_cmd, check_error=False, timeout=300)
+    stdout, stderr, returncode = _run_encode(lambda encoder_args: [
+        'ffmpeg', '-y',
+        *input_args,
+        '-filter_complex', filter_complex,
+        '-map', '[outv]',
+        *audio_args,
+        *encoder_args,
+        '-pix_fmt', 'yuv420p',
+        output_path
+    ], timeout=600)
 
     if returncode != 0:
         logger.error(f"FFmpeg concatenation failed: {stderr}")
         return None
 
     logger.info(f"Videos concatenated successfully. Output: {output_path}.")
+    return output_path
 
-    # Clean up temporary scaled videos and concat list
-    for clip in temp_scaled_videos:
-        if os.path.exists(clip):
-            os.remove(clip)
-    if os.path.exists(concat_list_path):
-        os.remove(concat_list_path)
-    if 'temp_looped_clip_path' in locals() and os.path.exists(temp_looped_clip_path):
-        os.remove(temp_looped_clip_path)
+def _concat_list_entry(path: str) -> str:
+    """
+    One concat-demuxer 'file' line for an absolute path; a ' inside the quoted path is written as '\\''.
+    The file: prefix stops ffmpeg from resolving the entry against the list's own URL when it is read from pipe:0.
+    """
+    escaped = os.fspath(path).replace("'", "'\\''")
+    return f"file 'file:{escaped}'\n"
 
-    return output_path
+def _concat_stream_copy(
+    video_paths: List[str],
+    output_path: str,
+    remaining_duration: float,
+    num_loops: int,
+    last_clip_duration: float
+) -> bool:
+    """
+    Concatenates already-conforming clips with the concat demuxer and -c copy.
+    Looping is done by listing the last clip num_loops more times, with an outpoint on the final repeat.
+    The list is fed to ffmpeg on stdin, so no list file is written or cleaned up.
+    """
+    # Paths must be absolute: relative entries would be resolved against the list's location
+    entries = [_concat_list_entry(os.path.abspath(clip)) for clip in video_paths]
+    if num_loops:
+        entries += [entries[len(video_paths) - 1]] * num_loops
+        entries.append(f"outpoint {remaining_duration - last_clip_duration * (num_loops - 1):.3f}\n")
+
+    concat_cmd = [
+        'ffmpeg', '-y',
+        '-f', 'concat',
+        '-safe', '0', # Allows absolute paths
+        '-protocol_whitelist', 'file,pipe',
+        '-i', 'pipe:0',
+        '-c', 'copy',
+        output_path
+    ]
+    stdout, stderr, returncode = run_shell_command(concat_cmd, check_error=False, timeout=300, input_text=''.join(entries))
+    if returncode != 0:
+        logger.warning(f"FFmpeg stream-copy concatenation failed: {stderr}")
+        return False
+    return True
 
 def add_audio_to_video(video_path: str, audio_path: str, output_path: str, audio_volume_db: float = 0.0) -> Optional[str]:
     """
@@ -208,8 +273,8 @@ def add_audio_to_video(video_path: str, audio_path: str, output_path: str, audio
     # -af "volume=...dB" applies volume filter
     cmd = [
         'ffmpeg', '-y',
-        '-i', shlex.quote(video_path),
-        '-i', shlex.quote(audio_path),
+        '-i', video_path,
+        '-i', audio_path,
         '-map', '0:v',
         '-map', '1:a',
         '-c:v', 'copy',
@@ -229,6 +294,64 @@ def add_audio_to_video(video_path: str, audio_path: str, output_path: str, audio
     return output_path
 
 
+def _build_subtitles_filter(subtitle_file_path: str, font_path: str) -> str:
+    """Builds the escaped subtitles= filter for an .ass file, pointing fontsdir at the chosen font."""
+    if not os.path.exists(font_path):
+        logger.warning(f"Font file not found at {font_path}. Subtitles may not render correctly. Falling back to system font.")
+        # Attempt to proceed but warn
+        font_path = "Arial" # Fallback to a common system font name if path not found
+
+    # FFmpeg requires font path to be absolute and potentially quoted
+    escaped_subtitle_file_path = subtitle_file_path.replace('\\', '/') # FFmpeg prefers forward slashes
+
+    # The subtitles filter does not directly take font_size, color, outline_color, outline_width, position
+    # as direct arguments. These are handled by the ASS file itself.
+    # The `font_path` is crucial for FFmpeg to find the specific font.
+    # We'll pass `fontsdir` to help FFmpeg locate the font.
+    fonts_dir = os.path.dirname(font_path) if os.path.exists(font_path) else "/usr/share/fonts/truetype/dejavu" # Common fallback
+    return f"subtitles={_escape_filter_value(escaped_subtitle_file_path)}:fontsdir={_escape_filter_value(fonts_dir)}"
+
+def add_audio_and_subtitles_to_video(
+    video_path: str,
+    audio_path: str,
+    subtitle_file_path: str,
+    output_path: str,
+    font_path: str,
+    audio_volume_db: float = 0.0
+) -> Optional[str]:
+    """
+    Replaces the audio track and burns in .ass subtitles in a single ffmpeg pass.
+    Same result as add_audio_to_video followed by add_subtitles_to_video, without the intermediate file.
+    """
+    logger.info(f"Adding audio from {audio_path} and subtitles from {subtitle_file_path} to {video_path}...")
+    for path in (video_path, audio_path, subtitle_file_path):
+        if not os.path.exists(path):
+            logger.error(f"Input file not found: {path}")
+            return None
+
+    subtitles_filter = _build_subtitles_filter(subtitle_file_path, font_path)
+    stdout, stderr, returncode = _run_encode(lambda encoder_args: [
+        'ffmpeg', '-y',
+        '-i', video_path,
+        '-i', audio_path,
+        '-filter_complex', f"[0:v]{subtitles_filter}[vout];[1:a]volume={audio_volume_db}dB[aout]",
+        '-map', '[vout]',
+        '-map', '[aout]',
+        *encoder_args,
+        '-pix_fmt', 'yuv420p',
+        '-c:a', 'aac',
+        '-b:a', '192k',
+        '-shortest', # Output duration is shortest of inputs
+        output_path
+    ], timeout=300)
+
+    if returncode != 0:
+        logger.error(f"FFmpeg failed to add audio and subtitles: {stderr}")
+        return None
+
+    logger.info(f"Audio and subtitles added to video. Output: {output_path}.")
+    return output_path
+
 def add_subtitles_to_video(
     video_path: str,
     subtitle_file_path: str,
@@ -250,33 +373,20 @@ def add_subtitles_to_video(
     if not os.path.exists(subtitle_file_path):
         logger.error(f"Subtitle file not found: {subtitle_file_path}")
         return False
-    if not os.path.exists(font_path):
-        logger.warning(f"Font file not found at {font_path}. Subtitles may not render correctly. Falling back to system font.")
-        # Attempt to proceed but warn
-        font_path = "Arial" # Fallback to a common system font name if path not found
+    subtitles_filter = _build_subtitles_filter(subtitle_file_path, font_path)
 
-    # FFmpeg requires font path to be absolute and potentially quoted
-    escaped_subtitle_file_path = subtitle_file_path.replace('\\', '/') # FFmpeg prefers forward slashes
-    
-    # The subtitles filter does not directly take font_size, color, outline_color, outline_width, position
-    # as direct arguments. These are handled by the ASS file itself.
-    # The `font_path` is crucial for FFmpeg to find the specific font.
-    # We'll pass `fontsdir` to help FFmpeg locate the font.
-    fonts_dir = os.path.dirname(font_path) if os.path.exists(font_path) else "/usr/share/fonts/truetype/dejavu" # Common fallback
-    
-    cmd = [
-        'ffmpeg', '-y',
-        '-i', shlex.quote(video_path),
-        '-vf', f"subtitles={shlex.quote(escaped_subtitle_file_path)}:fontsdir={shlex.quote(fonts_dir)}",
-        '-c:a', 'copy',
-        '-c:v', 'libx264',
-        '-preset', 'fast',
-        '-crf', '23',
-        '-pix_fmt', 'yuv420p',
-        shlex.quote(output_path)
-    ]
-    logger.info(f"Running FFmpeg subtitles command: {' '.join(cmd)}")
-    stdout, stderr, returncode = run_shell_command(cmd, check_error=False, timeout=300)
+    def build_cmd(encoder_args: List[str]) -> List[str]:
+        return [
+            'ffmpeg', '-y',
+            '-i', video_path,
+            '-vf', subtitles_filter,
+            '-c:a', 'copy',
+            *encoder_args,
+            '-pix_fmt', 'yuv420p',
+            output_path
+        ]
+    logger.info(f"Running FFmpeg subtitles command: {' '.join(build_cmd(_video_encoder_args()))}")
+    stdout, stderr, returncode = _run_encode(build_cmd, timeout=300)
 
     if returncode != 0:
         logger.error(f"FFmpeg failed to add subtitles: {stderr}")
@@ -285,18 +395,23 @@ def add_subtitles_to_video(
     logger.info(f"Subtitles added to video. Output: {output_path}.")
     return True
 
+def _escape_filter_value(value: str) -> str:
+    """
+    Escapes a path for use as a filter option value inside a -vf/-filter_complex string.
+    Two levels: quote the option value (a literal ' becomes '\\'') and then escape the filtergraph specials (\\ ' [ ] , ;).
+    """
+    value = "'" + value.replace("'", "'\\''") + "'"
+    return re.sub(r"([\\'\[\],;])", r"\\\1", value)
+
+# One-pass equivalent of escaping backslashes first, then quotes, colons and newlines
+_FFMPEG_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', "'": "\\'", ':': '\\:', '\n': '\\n'})
+
 def escape_ffmpeg_text(text: str) -> str:
     """
     Escapes special characters in text for FFmpeg's drawtext filter.
     Note: This is for drawtext, not typically needed for ASS subtitles as ASS handles its own escaping.
     Updated to handle newlines correctly.
     """
-    # Escape existing backslashes first to avoid double-escaping issues later
-    text = text.replace('\\', '\\\\')
-    # Escape single quotes, as they often delimit strings in filter options
-    text = text.replace("'", "\\'")
-    # Escape colons, crucial for filter options where : is a separator
-    text = text.replace(':', '\\:')
-    # Escape newlines, turning them into FFmpeg's internal newline representation
-    text = text.replace('\n', '\\n')
-    return text
+    # Backslashes, single quotes (option delimiters), colons (option separators) and newlines,
+    # all in a single str.translate pass
+    return text.translate(_FFMPEG_TEXT_ESCAPES)
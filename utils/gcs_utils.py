@@ -1,35 +1,95 @@
 import logging
 import os
 import io
+import concurrent.futures
+import threading
 from typing import Optional, List, Dict, Any, Tuple
-from google.cloud import storage
 
 from config import GLOBAL_CONFIG
 
 logger = logging.getLogger(__name__)
 
+_GCS_CLIENT = None # Cached storage.Client, created on first use
+_GCS_CLIENT_LOCK = threading.Lock() # Upload workers may request the client concurrently
+_BUCKETS: Dict[str, Any] = {} # Bucket handles by name; they share the cached client's HTTP session
+_UPLOAD_POOL: Optional[concurrent.futures.ThreadPoolExecutor] = None # Created on first async upload
+_PENDING_UPLOADS: List[concurrent.futures.Future] = []
+_GCS_HTTP_POOL_SIZE = 32 # Connections kept per host; matches the largest transfer thread pool
+_RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024 # Files above this upload as resumable sessions in 8 MiB chunks
+
+# The configured bucket never changes during a run, so validate it once at import.
+_DEFAULT_BUCKET_NAME = GLOBAL_CONFIG['gcp']['gcs_bucket_name']
+_DEFAULT_BUCKET_OK = bool(_DEFAULT_BUCKET_NAME) and _DEFAULT_BUCKET_NAME != 'your-gcs-bucket-name'
+
+def _resolve_bucket_name(bucket_name: Optional[str]) -> Optional[str]:
+    """Returns the explicit bucket name if given, else the configured default, or None if neither is usable."""
+    if bucket_name:
+        return bucket_name if bucket_name != 'your-gcs-bucket-name' else None
+    return _DEFAULT_BUCKET_NAME if _DEFAULT_BUCKET_OK else None
+
 def get_gcs_client():
     """
     Initializes and returns a Google Cloud Storage client.
     Attempts to use GOOGLE_APPLICATION_CREDENTIALS from a service account key path
     defined in config.py, or falls back to default credentials.
+    google.cloud.storage is imported here rather than at module level so that runs
+    which never touch GCS don't pay its import cost; the client is cached after the first call.
     """
+    global _GCS_CLIENT
+    if _GCS_CLIENT is not None:
+        return _GCS_CLIENT
+
+    with _GCS_CLIENT_LOCK:
+        if _GCS_CLIENT is None:
+            _GCS_CLIENT = _create_gcs_client()
+    return _GCS_CLIENT
+
+def _create_gcs_client():
+    """Builds the storage client; called by get_gcs_client under its lock."""
     try:
+        from google.cloud import storage
+
         if 'GOOGLE_APPLICATION_CREDENTIALS' not in os.environ:
             sa_key_path = GLOBAL_CONFIG['gcp']['service_account_key_path']
             if os.path.exists(sa_key_path) and os.path.isfile(sa_key_path):
                 os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = sa_key_path
-                logger.info(f"GOOGLE_APPLICATION_CREDENTIALS set from config: {sa_key_path}")
+                logger.info("GOOGLE_APPLICATION_CREDENTIALS set from config: %s", sa_key_path)
             else:
-                logger.warning(f"Service account key not found at {sa_key_path}. GCS client might use default credentials.")
+                logger.warning("Service account key not found at %s. GCS client might use default credentials.", sa_key_path)
 
-        client = storage.Client(project=GLOBAL_CONFIG['gcp']['project_id'])
+        client = storage.Client(project=GLOBAL_CONFIG['gcp']['project_id'], **_pooled_http_kwargs())
         logger.info("Google Cloud Storage client initialized.")
         return client
     except Exception as e:
-        logger.error(f"Failed to initialize Google Cloud Storage client: {e}", exc_info=True)
+        logger.error("Failed to initialize Google Cloud Storage client: %s", e, exc_info=True)
         return None
 
+def _pooled_http_kwargs() -> Dict[str, Any]:
+    """
+    Returns storage.Client kwargs for an AuthorizedSession whose connection pool fits the transfer thread pools.
+    The default pool holds 10 connections, so with more concurrent workers connections get dropped and reopened.
+    Returns {} (let the client build its own session) if default credentials can't be resolved here.
+    """
+    try:
+        import google.auth
+        from google.auth.transport.requests import AuthorizedSession
+        from requests.adapters import HTTPAdapter
+
+        credentials, _ = google.auth.default()
+        session = AuthorizedSession(credentials)
+        session.mount('https://', HTTPAdapter(pool_connections=_GCS_HTTP_POOL_SIZE, pool_maxsize=_GCS_HTTP_POOL_SIZE))
+        return {'credentials': credentials, '_http': session}
+    except Exception as e:
+        logger.warning("Could not build a pooled GCS HTTP session, using the client default: %s", e)
+        return {}
+
+def _get_bucket(client, bucket_name: str):
+    """Returns a cached Bucket handle for bucket_name, creating it on first use."""
+    bucket = _BUCKETS.get(bucket_name)
+    if bucket is None:
+        bucket = _BUCKETS.setdefault(bucket_name, client.bucket(bucket_name))
+    return bucket
+
 def upload_to_gcs(source_file_name: str, destination_blob_name: str, bucket_name: Optional[str] = None) -> bool:
     """Uploads a file to the GCS bucket."""
     client = get_gcs_client()
@@ -37,66 +97,130 @@ def upload_to_gcs(source_file_name: str, destination_blob_name: str, bucket_name
         return False
 
     if not os.path.exists(source_file_name):
-        logger.error(f"Source file for GCS upload not found: {source_file_name}")
+        logger.error("Source file for GCS upload not found: %s", source_file_name)
         return False
 
-    bucket_name = bucket_name if bucket_name else GLOBAL_CONFIG['gcp']['gcs_bucket_name']
-    if not bucket_name or bucket_name == 'your-gcs-bucket-name':
+    bucket_name = _resolve_bucket_name(bucket_name)
+    if not bucket_name:
         logger.error("GCS bucket name is not configured. Cannot upload file.")
         return False
 
     try:
-        bucket = client.bucket(bucket_name)
+        bucket = _get_bucket(client, bucket_name)
         blob = bucket.blob(destination_blob_name)
-        blob.upload_from_filename(source_file_name)
-        logger.info(f"File {source_file_name} uploaded to gs://{bucket_name}/{destination_blob_name}.")
+        if os.path.getsize(source_file_name) > _RESUMABLE_CHUNK_SIZE:
+            blob.chunk_size = _RESUMABLE_CHUNK_SIZE # Resumable upload: a dropped connection only resends one chunk
+        blob.upload_from_filename(source_file_name, checksum='crc32c') # crc32c is computed by the google-crc32c C extension
+        logger.info("File %s uploaded to gs://%s/%s.", source_file_name, bucket_name, destination_blob_name)
         return True
     except Exception as e:
-        logger.error(f"Failed to upload {source_file_name} to GCS bucket {bucket_name}: {e}", exc_info=True)
+        logger.error("Failed to upload %s to GCS bucket %s: %s", source_file_name, bucket_name, e, exc_info=True)
         return False
 
+def upload_to_gcs_async(source_file_name: str, destination_blob_name: str, bucket_name: Optional[str] = None) -> concurrent.futures.Future:
+    """
+    Schedules upload_to_gcs on a background thread pool and returns its Future (resolving to bool),
+    so the caller can keep producing artifacts while uploads run. All workers share the cached client.
+    Pool size comes from the GCS_UP_WORKERS environment variable (default 8).
+    """
+    global _UPLOAD_POOL
+    if _UPLOAD_POOL is None:
+        _UPLOAD_POOL = concurrent.futures.ThreadPoolExecutor(
+            max_workers=int(os.environ.get('GCS_UP_WORKERS', 8)),
+            thread_name_prefix='gcs-upload'
+        )
+    future = _UPLOAD_POOL.submit(upload_to_gcs, source_file_name, destination_blob_name, bucket_name)
+    _PENDING_UPLOADS.append(future)
+    return future
+
+def drain_uploads() -> Tuple[int, int]:
+    """
+    Waits for every upload scheduled via upload_to_gcs_async to finish.
+    Returns (succeeded, failed) counts.
+    """
+    succeeded, failed = 0, 0
+    for future in concurrent.futures.as_completed(list(_PENDING_UPLOADS)):
+        try:
+            if future.result():
+                succeeded += 1
+            else:
+                failed += 1
+        except Exception as e:
+            logger.error("Background GCS upload raised an error: %s", e, exc_info=True)
+            failed += 1
+    _PENDING_UPLOADS.clear()
+    if succeeded or failed:
+        logger.info("Background GCS uploads finished: %d succeeded, %d failed.", succeeded, failed)
+    return succeeded, failed
+
 def download_from_gcs(source_blob_name: str, destination_file_name: str, bucket_name: Optional[str] = None) -> bool:
     """Downloads a blob from the GCS bucket."""
     client = get_gcs_client()
     if not client:
         return False
 
-    bucket_name = bucket_name if bucket_name else GLOBAL_CONFIG['gcp']['gcs_bucket_name']
-    if not bucket_name or bucket_name == 'your-gcs-bucket-name':
+    bucket_name = _resolve_bucket_name(bucket_name)
+    if not bucket_name:
         logger.error("GCS bucket name is not configured. Cannot download file.")
         return False
 
     try:
-        bucket = client.bucket(bucket_name)
+        bucket = _get_bucket(client, bucket_name)
         blob = bucket.blob(source_blob_name)
-        blob.download_to_filename(destination_file_name)
-        logger.info(f"Blob gs://{bucket_name}/{source_blob_name} downloaded to {destination_file_name}.")
+        blob.download_to_filename(destination_file_name, checksum='crc32c')
+        logger.info("Blob gs://%s/%s downloaded to %s.", bucket_name, source_blob_name, destination_file_name)
         return True
     except Exception as e:
-        logger.error(f"Failed to download {source_blob_name} from GCS bucket {bucket_name}: {e}", exc_info=True)
+        logger.error("Failed to download %s from GCS bucket %s: %s", source_blob_name, bucket_name, e, exc_info=True)
         return False
 
+def _run_many(func, pairs: List[Tuple[str, str]], bucket_name: Optional[str], max_workers: Optional[int]) -> List[bool]:
+    """Runs func(a, b, bucket_name) for every pair on a thread pool; results keep the input order."""
+    if not pairs:
+        return []
+    workers = max_workers or min(32, len(pairs))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gcs-transfer') as executor:
+        return list(executor.map(lambda pair: func(pair[0], pair[1], bucket_name), pairs))
+
+def upload_many_to_gcs(file_blob_pairs: List[Tuple[str, str]], bucket_name: Optional[str] = None, max_workers: Optional[int] = None) -> List[bool]:
+    """
+    Uploads many (source_file_name, destination_blob_name) pairs concurrently over the shared client.
+    Returns one success flag per pair, in order.
+    """
+    results = _run_many(upload_to_gcs, file_blob_pairs, bucket_name, max_workers)
+    logger.info("Uploaded %d/%d files to GCS.", sum(results), len(results))
+    return results
+
+def download_many_from_gcs(blob_file_pairs: List[Tuple[str, str]], bucket_name: Optional[str] = None, max_workers: Optional[int] = None) -> List[bool]:
+    """
+    Downloads many (source_blob_name, destination_file_name) pairs concurrently over the shared client.
+    Returns one success flag per pair, in order.
+    """
+    results = _run_many(download_from_gcs, blob_file_pairs, bucket_name, max_workers)
+    logger.info("Downloaded %d/%d blobs from GCS.", sum(results), len(results))
+    return results
+
 def list_blobs(bucket_name: Optional[str] = None, prefix: Optional[str] = None) -> List[str]:
     """Lists all the blobs in the bucket that begin with the prefix."""
     client = get_gcs_client()
     if not client:
         return []
 
-    bucket_name = bucket_name if bucket_name else GLOBAL_CONFIG['gcp']['gcs_bucket_name']
-    if not bucket_name or bucket_name == 'your-gcs-bucket-name':
+    bucket_name = _resolve_bucket_name(bucket_name)
+    if not bucket_name:
         logger.error("GCS bucket name is not configured. Cannot list blobs.")
         return []
 
     blobs_list = []
     try:
-        bucket = client.bucket(bucket_name)
+        bucket = _get_bucket(client, bucket_name)
         blobs = bucket.list_blobs(prefix=prefix)
         for blob in blobs:
             blobs_list.append(blob.name)
-        logger.info(f"Listed {len(blobs_list)} blobs in bucket {bucket_name} with prefix {prefix}.")
+        logger.info("Listed %d blobs in bucket %s with prefix %s.", len(blobs_list), bucket_name, prefix)
         return blobs_list
     except Exception as e:
-        logger.error(f"Failed to list blobs in bucket {bucket_name} with prefix {prefix}: {e}", exc_info=True)
+        logger.error("Failed to list blobs in bucket %s with prefix %s: %s", bucket_name, prefix, e, exc_info=True)
         return []
 
 def delete_blob(blob_name: str, bucket_name: Optional[str] = None) -> bool:
@@ -105,17 +229,50 @@ def delete_blob(blob_name: str, bucket_name: Optional[str] = None) -> bool:
     if not client:
         return False
 
-    bucket_name = bucket_name if bucket_name else GLOBAL_CONFIG['gcp']['gcs_bucket_name']
-    if not bucket_name or bucket_name == 'your-gcs-bucket-name':
+    bucket_name = _resolve_bucket_name(bucket_name)
+    if not bucket_name:
         logger.error("GCS bucket name is not configured. Cannot delete blob.")
         return False
 
     try:
-        bucket = client.bucket(bucket_name)
+        bucket = _get_bucket(client, bucket_name)
         blob = bucket.blob(blob_name)
         blob.delete()
-        logger.info(f"Blob gs://{bucket_name}/{blob_name} deleted.")
+        logger.info("Blob gs://%s/%s deleted.", bucket_name, blob_name)
         return True
     except Exception as e:
-        logger.error(f"Failed to delete blob {blob_name} from GCS bucket {bucket_name}: {e}", exc_info=True)
+        logger.error("Failed to delete blob %s from GCS bucket %s: %s", blob_name, bucket_name, e, exc_info=True)
+        return False
+
+_GCS_BATCH_LIMIT = 100 # Maximum number of calls the GCS JSON API accepts in one batch request
+
+def delete_blobs(blob_names: List[str], bucket_name: Optional[str] = None) -> bool:
+    """
+    Deletes many blobs using GCS batch requests, sending up to 100 deletes per HTTP round trip.
+    Returns True only if every batch succeeded.
+    """
+    if not blob_names:
+        return True
+
+    client = get_gcs_client()
+    if not client:
         return False
+
+    bucket_name = _resolve_bucket_name(bucket_name)
+    if not bucket_name:
+        logger.error("GCS bucket name is not configured. Cannot delete blobs.")
+        return False
+
+    bucket = _get_bucket(client, bucket_name)
+    all_ok = True
+    for start in range(0, len(blob_names), _GCS_BATCH_LIMIT):
+        chunk = blob_names[start:start + _GCS_BATCH_LIMIT]
+        try:
+            with client.batch():
+                for blob_name in chunk:
+                    bucket.blob(blob_name).delete()
+            logger.info("Deleted %d blobs from gs://%s in one batch request.", len(chunk), bucket_name)
+        except Exception as e:
+            logger.error("Batch delete of %d blobs from GCS bucket %s failed: %s", len(chunk), bucket_name, e, exc_info=True)
+            all_ok = False
+    return all_ok
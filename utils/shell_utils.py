@@ -1,19 +1,40 @@
 import subprocess
 import logging
 import shlex
+import shutil
+import functools
 from typing import List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
-def run_shell_command(command_args: List[str], check_error: bool = True, timeout: Optional[int] = 120) -> Tuple[str, str, int]:
+class _LazyCommandLine:
+    """Log argument that renders the argv with shlex.join only if a record is actually emitted."""
+    __slots__ = ('args',)
+
+    def __init__(self, args: List[str]):
+        self.args = args
+
+    def __str__(self) -> str:
+        return shlex.join(self.args)
+
+@functools.lru_cache(maxsize=64)
+def _resolve_executable(name: str) -> str:
+    """Returns the absolute path of an executable on PATH (cached), or the name unchanged if not found."""
+    return shutil.which(name) or name
+
+def run_shell_command(command_args: List[str], check_error: bool = True, timeout: Optional[int] = 120, input_text: Optional[str] = None) -> Tuple[str, str, int]:
     """
     Executes a shell command and returns its stdout, stderr, and return code.
 
     Args:
         command_args (List[str]): A list of strings representing the command and its arguments.
                                    Example: ['ffmpeg', '-i', 'input.mp4', 'output.mp4']
+                                   The list is executed directly (shell=False), so arguments must be
+                                   passed raw: wrapping paths in shlex.quote puts literal quotes in them.
         check_error (bool): If True, raises a RuntimeError if the command returns a non-zero exit code.
         timeout (Optional[int]): Maximum time in seconds to wait for the command to complete.
+        input_text (Optional[str]): Written to the command's stdin (e.g. an ffmpeg concat list read from pipe:0).
+                                    When None, stdin is /dev/null.
 
     Returns:
         Tuple[str, str, int]: A tuple containing (stdout, stderr, returncode).
@@ -22,13 +43,20 @@ def run_shell_command(command_args: List[str], check_error: bool = True, timeout
         RuntimeError: If check_error is True and the command fails, or if the command is not found.
         subprocess.TimeoutExpired: If the command times out.
     """
-    command_for_log = shlex.join(command_args)
-    logger.info(f"Executing command: {command_for_log}")
+    command_for_log = _LazyCommandLine(command_args)
+    logger.info("Executing command: %s", command_for_log)
 
     try:
+        # Keep the kwargs posix_spawn-compatible: an absolute executable path, close_fds=False and
+        # no preexec_fn/pass_fds/cwd/start_new_session. Otherwise CPython falls back to fork+exec,
+        # which gets slow once the process holds large models in memory. close_fds=False doesn't
+        # leak descriptors since Python opens them non-inheritable (PEP 446).
         result = subprocess.run(
-            command_args,
+            [_resolve_executable(command_args[0]), *command_args[1:]],
+            stdin=subprocess.DEVNULL if input_text is None else None, # Never let a child block on, or inherit, our stdin
+            input=input_text, # run() switches stdin to a pipe when this is set
             capture_output=True,
+            close_fds=False,
             text=True,
             check=False, # We handle check_error manually
             timeout=timeout
@@ -39,26 +67,27 @@ def run_shell_command(command_args: List[str], check_error: bool = True, timeout
         returncode = result.returncode
 
         if returncode != 0:
-            logger.error(f"Command failed with exit code {returncode}: {command_for_log}\nSTDOUT: {stdout}\nSTDERR: {stderr}")
+            logger.error("Command failed with exit code %d: %s\nSTDOUT: %s\nSTDERR: %s", returncode, command_for_log, stdout, stderr)
             if check_error:
                 raise RuntimeError(f"Command failed with exit code {returncode}: {command_for_log}\nSTDOUT: {stdout}\nSTDERR: {stderr}")
         else:
-            logger.info(f"Command executed successfully (exit code {returncode}): {command_for_log}")
+            logger.info("Command executed successfully (exit code %d): %s", returncode, command_for_log)
+            # ffmpeg writes its whole progress report to stderr, so on success both streams are debug detail
             if stdout:
-                logger.info(f"STDOUT: {stdout}")
+                logger.debug("STDOUT: %s", stdout)
             if stderr:
-                logger.warning(f"STDERR: {stderr}")
+                logger.debug("STDERR: %s", stderr)
 
         return stdout, stderr, returncode
 
     except FileNotFoundError:
-        logger.critical(f"Command not found. Make sure the executable is in your PATH: {command_args[0]}")
+        logger.critical("Command not found. Make sure the executable is in your PATH: %s", command_args[0])
         raise RuntimeError(f"Command not found: {command_args[0]}")
     except subprocess.TimeoutExpired:
-        logger.error(f"Command timed out after {timeout} seconds: {command_for_log}")
+        logger.error("Command timed out after %s seconds: %s", timeout, command_for_log)
         result.kill() # Terminate the process
         result.wait() # Wait for it to terminate
         raise
     except Exception as e:
-        logger.critical(f"An unexpected error occurred while running command {command_for_log}: {e}", exc_info=True)
+        logger.critical("An unexpected error occurred while running command %s: %s", command_for_log, e, exc_info=True)
         raise
@@ -1,166 +1,535 @@
-# Cell (X): utils/video_utils.py (FIXED: Robust Dummy Video with Audio)
-import logging
-import os
-import shlex
-import subprocess
-import requests
-import time # Added for retry delay
-from typing import Optional, Tuple, List, Dict, Any
-
-from utils.shell_utils import run_shell_command
-from config import GLOBAL_CONFIG
-
-logger = logging.getLogger(__name__)
-
-# Basic retry decorator for API calls
-def retry(max_attempts=3, delay_seconds=2, catch_errors=(requests.exceptions.RequestException,)):
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            for attempt in range(1, max_attempts + 1):
-                try:
-                    return func(*args, **kwargs)
-                except catch_errors as e:
-                    logger.warning(f"Attempt {attempt}/{max_attempts} failed for {func.__name__}: {e}")
-                    if attempt < max_attempts:
-                        time.sleep(delay_seconds)
-                    else:
-                        logger.error(f"All {max_attempts} attempts failed for {func.__name__}.")
-                        raise
-        return wrapper
-    return decorator
-
-
-def get_video_duration(video_path: str) -> Optional[float]:
-    """
-    Gets the duration of a video file in seconds using ffprobe.
-    Returns None if the duration cannot be determined.
-    """
-    if not os.path.exists(video_path):
-        logger.warning(f"Video file not found for duration check: {video_path}")
-        return None
-
-    cmd = ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1', shlex.quote(video_path)]
-    stdout, stderr, returncode = run_shell_command(cmd, check_error=False)
-
-    if returncode != 0:
-        logger.warning(f"ffprobe failed to get duration for {video_path}: {stderr}")
-        return None
-
-    try:
-        duration = float(stdout.strip())
-        return duration
-    except ValueError:
-        logger.warning(f"Could not parse duration from ffprobe output for {video_path}: {stdout}")
-        return None
-
-def get_video_resolution(video_path: str) -> Optional[Tuple[int, int]]:
-    """
-    Gets the resolution (width, height) of a video file using ffprobe.
-    Returns None if the resolution cannot be determined.
-    """
-    if not os.path.exists(video_path):
-        logger.warning(f"Video file not found for resolution check: {video_path}")
-        return None
-
-    cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=width,height',
-           '-of', 'csv=p=0:s=x', shlex.quote(video_path)]
-    stdout, stderr, returncode = run_shell_command(cmd, check_error=False)
-
-    if returncode != 0:
-        logger.warning(f"ffprobe failed to get resolution for {video_path}: {stderr}")
-        return None
-
-    try:
-        width, height = map(int, stdout.strip().split('x'))
-        return width, height
-    except ValueError:
-        logger.warning(f"Could not parse resolution from ffprobe output for {video_path}: {stdout}")
-        return None
-
-@retry(max_attempts=3, delay_seconds=5) # Apply retry decorator
-def download_video_clip(video_url: str, output_path: str) -> Optional[str]:
-    """
-    Downloads a video clip from a URL.
-    Improved with robust error handling and retries.
-    FIX: Create a more robust dummy video with a simple audio track.
-    """
-    logger.info(f"Attempting to download video clip from {video_url} to {output_path}")
-
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-    try:
-        # Create a dummy video with a silent audio track for robustness
-        dummy_cmd = [
-            'ffmpeg', '-y',
-            '-f', 'lavfi', '-i', 'color=c=black:s=640x360:d=1', # Video stream
-            '-f', 'lavfi', '-i', 'anullsrc=channel_layout=stereo:sample_rate=44100', # Silent audio stream
-            '-t', '1', # Duration of 1 second
-            '-pix_fmt', 'yuv420p', # Pixel format
-            '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '30', # Video codec
-            '-c:a', 'aac', '-b:a', '128k', # Audio codec
-            shlex.quote(output_path)
-        ]
-        stdout, stderr, returncode = run_shell_command(dummy_cmd, check_error=False, timeout=10)
-        if returncode != 0:
-            logger.warning(f"Failed to create dummy video with audio via ffmpeg, creating empty file instead: {stderr}")
-            with open(output_path, 'wb') as f:
-                f.write(b'DUMMY VIDEO CONTENT')
-        logger.info(f"Simulated video download complete. Dummy file created at: {output_path}")
-
-        if os.path.exists(output_path):
-            return output_path
-        else:
-            logger.error(f"Failed to create dummy video file at {output_path}")
-            return None
-    except requests.exceptions.RequestException as req_err:
-        logger.error(f"Network or request error during download of {video_url}: {req_err}")
-        raise # Re-raise to trigger retry decorator
-    except Exception as e:
-        logger.error(f"An unexpected error occurred during download of {video_url}: {e}", exc_info=True)
-        return None
-
-@retry(max_attempts=3, delay_seconds=5) # Apply retry decorator
-def search_pexels_videos(query: str, api_key: str, orientation: str = 'portrait', per_page: int = 10) -> List[Dict[str, Any]]:
-    """
-    Searches for videos on Pexels. This is a functional placeholder.
-    Improved with robust error handling and retries.
-    """
-    logger.info(f"Simulating Pexels video search for '{query}', orientation: '{orientation}'")
-    dummy_videos = []
-    for i in range(min(per_page, 3)): # Return a few dummy results
-        dummy_videos.append({
-            "id": f"pexels_dummy_{i}",
-            "url": f"https://www.pexels.com/video/dummy-video-{i}/",
-            "image": "https://images.pexels.com/videos/pixels-dummy.jpeg",
-            "duration": 15 + i*5, # Dummy duration
-            "video_files": [
-                {"link": f"http://example.com/dummy_pexels_video_{i}.mp4", "quality": "hd", "width": 1080, "height": 1920, "fps": 30},
-                {"link": f"http://example.com/dummy_pexels_video_sd_{i}.mp4", "quality": "sd", "width": 720, "height": 1280, "fps": 30}
-            ]
-        })
-    logger.info(f"Simulated Pexels search returned {len(dummy_videos)} results.")
-    return dummy_videos
-
-@retry(max_attempts=3, delay_seconds=5) # Apply retry decorator
-def search_pixabay_videos(query: str, api_key: str, editors_choice: bool = True, per_page: int = 10) -> List[Dict[str, Any]]:
-    """
-    Searches for videos on Pixabay. This is a functional placeholder.
-    Improved with robust error handling and retries.
-    """
-    logger.info(f"Simulating Pixabay video search for '{query}', editors_choice: {editors_choice}")
-    dummy_videos = []
-    for i in range(min(per_page, 3)): # Return a few dummy results
-        dummy_videos.append({
-            "id": f"pixabay_dummy_{i}",
-            "pageURL": f"https://pixabay.com/videos/dummy-video-{i}/",
-            "picture_id": f"dummy_{i}",
-            "duration": 20 + i*3, # Dummy duration
-            "videos": {
-                "tiny": {"url": f"http://example.com/dummy_pixabay_tiny_video_{i}.mp4"},
-                "small": {"url": f"http://example.com/dummy_pixabay_small_video_{i}.mp4"},
-                "medium": {"url": f"http://example.com/dummy_pixabay_medium_video_{i}.mp4"},
-                "large": {"url": f"http://example.com/dummy_pixabay_large_video_{i}.mp4"}
-            }
-        })
-    logger.info(f"Simulated Pixabay search returned {len(dummy_videos)} results.")
-    return dummy_videos
\ No newline at end of file
+# Cell (X): utils/video_utils.py (FIXED: Robust Dummy Video with Audio)
+import logging
+import os
+import json
+import base64
+import struct
+import functools
+import concurrent.futures
+import threading
+import shelve
+from collections import OrderedDict
+import shutil
+import subprocess
+import requests
+import time
+from typing import Optional, Tuple, List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# PyAV reads container headers in-process; without it probes fall back to the ffprobe CLI
+try:
+    import av
+    _HAS_PYAV = True
+except ImportError:
+    _HAS_PYAV = False
+
+from utils.shell_utils import run_shell_command
+from config import GLOBAL_CONFIG
+from new_features.cost_analyzer import cost_analyzer
+
+logger = logging.getLogger(__name__)
+
+PEXELS_VIDEO_SEARCH_URL = "https://api.pexels.com/videos/search"
+PIXABAY_VIDEO_SEARCH_URL = "https://pixabay.com/api/videos/"
+_SIMULATED_URL_PREFIX = "http://example.com/" # Links returned by the simulated searches below
+
+# Shared HTTP session for all stock-footage calls: keeps TCP/TLS connections alive per host
+# and retries rate limits (honouring Retry-After) and transient server errors inside urllib3, with exponential
+# backoff capped at backoff_max plus random jitter so parallel workers don't retry in lockstep.
+# Only those statuses are retried; bad keys (401/403) or missing resources (404) fail on the first response.
+# raise_on_status=False hands the last retried response back, so raise_for_status() reports its real status.
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'EinsteinCoder-VideoPipeline/2.0'})
+_HTTP_RETRY = Retry(total=3, backoff_factor=0.5, backoff_jitter=1.0, backoff_max=30,
+                    status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET", "HEAD"), raise_on_status=False)
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_HTTP_RETRY))
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_HTTP_RETRY))
+_API_TIMEOUT = (3, 10) # (connect, read) seconds for search calls
+_DOWNLOAD_TIMEOUT = (5, 30) # (connect, read) seconds for clip downloads
+_DOWNLOAD_BUFFER_SIZE = 1 << 20 # 1 MiB copy buffer for streamed clip downloads
+
+# Static ffprobe argv prefix; each probe only appends the input path.
+# Duration and dimensions come from the container header, so cap how much stream data ffprobe reads.
+_FFPROBE_JSON_ARGS = ('ffprobe', '-v', 'error', '-probesize', '500K', '-analyzeduration', '0',
+                      '-show_format', '-show_streams', '-print_format', 'json')
+
+# 1-second 640x360 black H.264 clip with a silent stereo AAC track (3.4 KB), pre-encoded with
+# ffmpeg -f lavfi -i color=c=black:s=640x360:d=1 -f lavfi -i anullsrc -t 1 -pix_fmt yuv420p -c:v libx264 -crf 51 -c:a aac -movflags +faststart
+_DUMMY_MP4_B64 = (
+    'AAAAIGZ0eXBpc29tAAACAGlzb21pc28yYXZjMW1wNDEAAAd/bW9vdgAAAGxtdmhkAAAAAAAAAAAAAAAAAAAD6AAAA+gAAQAAAQAA'
+    'AAAAAAAAAAAAAAEAAAAAAAAAAAAAAAAAAAABAAAAAAAAAAAAAAAAAABAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAwAA'
+    'A510cmFrAAAAXHRraGQAAAADAAAAAAAAAAAAAAABAAAAAAAAA+gAAAAAAAAAAAAAAAAAAAAAAAEAAAAAAAAAAAAAAAAAAAABAAAA'
+    'AAAAAAAAAAAAAABAAAAAAoAAAAFoAAAAAAAkZWR0cwAAABxlbHN0AAAAAAAAAAEAAAPoAAAEAAABAAAAAAMVbWRpYQAAACBtZGhk'
+    'AAAAAAAAAAAAAAAAAAAyAAAAMgBVxAAAAAAALWhkbHIAAAAAAAAAAHZpZGUAAAAAAAAAAAAAAABWaWRlb0hhbmRsZXIAAAACwG1p'
+    'bmYAAAAUdm1oZAAAAAEAAAAAAAAAAAAAACRkaW5mAAAAHGRyZWYAAAAAAAAAAQAAAAx1cmwgAAAAAQAAAoBzdGJsAAAAxHN0c2QA'
+    'AAAAAAAAAQAAALRhdmMxAAAAAAAAAAEAAAAAAAAAAAAAAAAAAAAAAoABaABIAAAASAAAAAAAAAABDExhdmMgbGlieDI2NAAAAAAA'
+    'AAAAAAAAAAAAAAAAAAAAGP//AAAAOmF2Y0MBZAAf/+EAHGdkAB+scgRAoC/5cBEAAAMAAQAAAwAyDxgxhGABAAdo6EOBlLIs/fj4'
+    'AAAAABBwYXNwAAAAAQAAAAEAAAAUYnRydAAAAAAAACXQAAAl0AAAABhzdHRzAAAAAAAAAAEAAAAZAAACAAAAABRzdHNzAAAAAAAA'
+    'AAEAAAABAAAAeGN0dHMAAAAAAAAADQAAAAEAAAQAAAAAAQAAFAAAAAABAAAIAAAAAAMAAAAAAAAABAAAAgAAAAABAAAUAAAAAAEA'
+    'AAgAAAAAAwAAAAAAAAAEAAACAAAAAAEAAA4AAAAAAQAABgAAAAACAAAAAAAAAAIAAAIAAAAAKHN0c2MAAAAAAAAAAgAAAAEAAAAC'
+    'AAAAAQAAAAIAAAABAAAAAQAAAHhzdHN6AAAAAAAAAAAAAAAZAAADBwAAABIAAAARAAAAEQAAABEAAAARAAAAEQAAABEAAAARAAAA'
+    'EQAAABcAAAARAAAAEgAAABIAAAASAAAAEgAAABIAAAASAAAAEgAAABkAAAASAAAAEgAAABIAAAASAAAAEgAAAHBzdGNvAAAAAAAA'
+    'ABgAAAevAAAKzgAACusAAAsIAAALJQAACzwAAAtZAAALdgAAC5MAAAuqAAALzQAAC+oAAAwCAAAMIAAADD4AAAxcAAAMdAAADJIA'
+    'AAywAAAM1QAADO0AAA0LAAANKQAADUEAAAMxdHJhawAAAFx0a2hkAAAAAwAAAAAAAAAAAAAAAgAAAAAAAAPoAAAAAAAAAAAAAAAB'
+    'AQAAAAABAAAAAAAAAAAAAAAAAAAAAQAAAAAAAAAAAAAAAAAAQAAAAAAAAAAAAAAAAAAAJGVkdHMAAAAcZWxzdAAAAAAAAAABAAAD'
+    '6AAABAAAAQAAAAACqW1kaWEAAAAgbWRoZAAAAAAAAAAAAAAAAAAArEQAALBEVcQAAAAAAC1oZGxyAAAAAAAAAABzb3VuAAAAAAAA'
+    'AAAAAAAAU291bmRIYW5kbGVyAAAAAlRtaW5mAAAAEHNtaGQAAAAAAAAAAAAAACRkaW5mAAAAHGRyZWYAAAAAAAAAAQAAAAx1cmwg'
+    'AAAAAQAAAhhzdGJsAAAAfnN0c2QAAAAAAAAAAQAAAG5tcDRhAAAAAAAAAAEAAAAAAAAAAAACABAAAAAArEQAAAAAADZlc2RzAAAA'
+    'AAOAgIAlAAIABICAgBdAFQAAAAAAfQAAAAg+BYCAgAUSEFblAAaAgIABAgAAABRidHJ0AAAAAAAAfQAAAAg+AAAAIHN0dHMAAAAA'
+    'AAAAAgAAACwAAAQAAAAAAQAAAEQAAAC4c3RzYwAAAAAAAAAOAAAAAQAAAAEAAAABAAAAAgAAAAIAAAABAAAABQAAAAEAAAABAAAA'
+    'BgAAAAIAAAABAAAACQAAAAEAAAABAAAACgAAAAIAAAABAAAADAAAAAEAAAABAAAADQAAAAIAAAABAAAAEAAAAAEAAAABAAAAEQAA'
+    'AAIAAAABAAAAFAAAAAEAAAABAAAAFQAAAAIAAAABAAAAFwAAAAEAAAABAAAAGAAAAAYAAAABAAAAFHN0c3oAAAAAAAAABgAAAC0A'
+    'AABwc3RjbwAAAAAAAAAYAAAKyAAACt8AAAr8AAALGQAACzYAAAtNAAALagAAC4cAAAukAAALwQAAC94AAAv8AAAMFAAADDIAAAxQ'
+    'AAAMbgAADIYAAAykAAAMyQAADOcAAAz/AAANHQAADTsAAA1TAAAAGnNncGQBAAAAcm9sbAAAAAIAAAAB//8AAAAcc2JncAAAAABy'
+    'b2xsAAAAAQAAAC0AAAABAAAAPXVkdGEAAAA1bWV0YQAAAAAAAAAhaGRscgAAAAAAAAAAbWRpcmFwcGwAAAAAAAAAAAAAAAAIaWxz'
+    'dAAAAAhmcmVlAAAF0G1kYXQAAAKwBgX//6zcRem95tlIt5Ys2CDZI+7veDI2NCAtIGNvcmUgMTY0IHIzMTkxIDQ2MTNhYzMgLSBI'
+    'LjI2NC9NUEVHLTQgQVZDIGNvZGVjIC0gQ29weWxlZnQgMjAwMy0yMDI0IC0gaHR0cDovL3d3dy52aWRlb2xhbi5vcmcveDI2NC5o'
+    'dG1sIC0gb3B0aW9uczogY2FiYWM9MSByZWY9MTYgZGVibG9jaz0xOjA6MCBhbmFseXNlPTB4MzoweDEzMyBtZT11bWggc3VibWU9'
+    'MTAgcHN5PTEgcHN5X3JkPTEuMDA6MC4wMCBtaXhlZF9yZWY9MSBtZV9yYW5nZT0yNCBjaHJvbWFfbWU9MSB0cmVsbGlzPTIgOHg4'
+    'ZGN0PTEgY3FtPTAgZGVhZHpvbmU9MjEsMTEgZmFzdF9wc2tpcD0xIGNocm9tYV9xcF9vZmZzZXQ9LTIgdGhyZWFkcz0xIGxvb2th'
+    'aGVhZF90aHJlYWRzPTEgc2xpY2VkX3RocmVhZHM9MCBucj0wIGRlY2ltYXRlPTEgaW50ZXJsYWNlZD0wIGJsdXJheV9jb21wYXQ9'
+    'MCBjb25zdHJhaW5lZF9pbnRyYT0wIGJmcmFtZXM9OCBiX3B5cmFtaWQ9MiBiX2FkYXB0PTIgYl9iaWFzPTAgZGlyZWN0PTMgd2Vp'
+    'Z2h0Yj0xIG9wZW5fZ29wPTAgd2VpZ2h0cD0yIGtleWludD0yNTAga2V5aW50X21pbj0yNSBzY2VuZWN1dD00MCBpbnRyYV9yZWZy'
+    'ZXNoPTAgcmNfbG9va2FoZWFkPTYwIHJjPWNyZiBtYnRyZWU9MSBjcmY9NTEuMCBxY29tcD0wLjYwIHFwbWluPTAgcXBtYXg9Njkg'
+    'cXBzdGVwPTQgaXBfcmF0aW89MS40MCBhcT0xOjEuMDAAgAAAAE9liIEABP8eu7/+VJgAAAMAAAMAA8SAWSAYsAyIBugAAAMAAAMA'
+    'AAMAAAMAAAMAAAMAAAMAAAMAAAMAAAMAAAMAAAMAAAMAAAMAAAMAAAsJAAAADkGaCS2IT/8AAAMAABJwIRAEYIwcAAAADUGeEIcR'
+    '/wAAAwAANmEhEARgjBwhEARgjBwAAAANAZ4YJoi/AAADAAA3oCEQBGCMHCEQBGCMHAAAAA0BnhhGiL8AAAMAADehIRAEYIwcIRAE'
+    'YIwcAAAADQGeGGaIvwAAAwAAN6EhEARgjBwAAAANAZ4YrUi/AAADAAA3oSEQBGCMHCEQBGCMHAAAAA0BnhjNSL8AAAMAADehIRAE'
+    'YIwcIRAEYIwcAAAADQGeGO1IvwAAAwAAN6AhEARgjBwhEARgjBwAAAANAZ4ZDUi/AAADAAA3oCEQBGCMHAAAABNBmhpJNQIC0TKY'
+    'EI8AAAMAABUxIRAEYIwcIRAEYIwcAAAADUGeIaXEfwAAAwAANmAhEARgjBwhEARgjBwAAAAOAZ4pRaIv/wAAAwAAN6AhEARgjBwA'
+    'AAAOAZ4pZaIv/wAAAwAAN6EhEARgjBwhEARgjBwAAAAOAZ4phaIv/wAAAwAAN6EhEARgjBwhEARgjBwAAAAOAZ4pzJIv/wAAAwAA'
+    'N6EhEARgjBwhEARgjBwAAAAOAZ4p7JIv/wAAAwAAN6AhEARgjBwAAAAOAZ4qDJIv/wAAAwAAN6AhEARgjBwhEARgjBwAAAAOAZ4q'
+    'LJIv/wAAAwAAN6EhEARgjBwhEARgjBwAAAAVQZorCbUCAtrRMpgBF/8AAAMAAB6QIRAEYIwcIRAEYIwcAAAADkGeMqSxH/8AAAMA'
+    'ADZgIRAEYIwcAAAADgGeOmSoi/8AAAMAADehIRAEYIwcIRAEYIwcAAAADgGeOoSoi/8AAAMAADegIRAEYIwcIRAEYIwcAAAADgGe'
+    'OszSL/8AAAMAADehIRAEYIwcAAAADgGeOuzSL/8AAAMAADehIRAEYIwcIRAEYIwcIRAEYIwcIRAEYIwcIRAEYIwcIRAEYIwc'
+)
+_DUMMY_MP4_BYTES = base64.b64decode(_DUMMY_MP4_B64)
+
+# At most one in-flight request per stock-footage API, so retrying workers don't stampede a rate-limited host
+_PEXELS_API_SEMAPHORE = threading.BoundedSemaphore(1)
+_PIXABAY_API_SEMAPHORE = threading.BoundedSemaphore(1)
+
+
+def _probe_with_pyav(video_path: str) -> Dict[str, Any]:
+    """
+    Reads format and stream info with PyAV, shaped like ffprobe's JSON output
+    so the getters below don't care which backend produced it.
+    """
+    with av.open(video_path, metadata_errors='ignore') as container:
+        probe: Dict[str, Any] = {'format': {}, 'streams': []}
+        if container.duration:
+            probe['format']['duration'] = str(container.duration / av.time_base)
+        for stream in container.streams:
+            info: Dict[str, Any] = {'codec_type': stream.type, 'codec_name': stream.codec_context.name}
+            if stream.type == 'video':
+                info['width'] = stream.codec_context.width
+                info['height'] = stream.codec_context.height
+                info['pix_fmt'] = stream.codec_context.pix_fmt
+                info['avg_frame_rate'] = str(stream.average_rate or '0/0')
+                if stream.time_base:
+                    info['time_base'] = str(stream.time_base)
+                if stream.codec_context.profile:
+                    info['profile'] = stream.codec_context.profile
+            elif stream.type == 'audio':
+                info['sample_rate'] = str(stream.codec_context.sample_rate)
+                info['channels'] = stream.codec_context.channels
+            probe['streams'].append(info)
+        return probe
+
+@functools.lru_cache(maxsize=512)
+def _probe_cached(video_path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    """
+    Runs a single JSON ffprobe for format and stream info.
+    mtime_ns and size are only part of the cache key, so a rewritten file is probed again.
+    """
+    if _HAS_PYAV:
+        try:
+            return _probe_with_pyav(video_path)
+        except Exception as e:
+            logger.warning(f"PyAV could not open {video_path}, falling back to ffprobe: {e}")
+
+    stdout, stderr, returncode = run_shell_command([*_FFPROBE_JSON_ARGS, video_path], check_error=False)
+    if returncode != 0:
+        logger.warning(f"ffprobe failed for {video_path}: {stderr}")
+        return None
+    try:
+        return json.loads(stdout)
+    except ValueError:
+        logger.warning(f"Could not parse ffprobe JSON output for {video_path}: {stdout}")
+        return None
+
+def probe_video(video_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the parsed ffprobe output ('format' and 'streams') for a media file,
+    memoized per (path, mtime, size). Returns None if the file is missing or cannot be probed.
+    """
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return None
+    return _probe_cached(video_path, st.st_mtime_ns, st.st_size)
+
+def probe_many(video_paths: List[str], max_workers: Optional[int] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Probes several media files concurrently (up to os.cpu_count() ffprobe processes at once)
+    and returns {path: probe result or None}. Results land in probe_video's cache, so later
+    get_video_duration/get_video_resolution calls on the same files don't spawn ffprobe again.
+    """
+    unique_paths = list(dict.fromkeys(video_paths))
+    if len(unique_paths) <= 1:
+        return {path: probe_video(path) for path in unique_paths}
+
+    workers = max_workers or min(len(unique_paths), os.cpu_count() or 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(unique_paths, executor.map(probe_video, unique_paths)))
+
+_MP4_EXTENSIONS = ('.mp4', '.mov', '.m4v', '.m4a')
+
+def _read_mp4_duration(video_path: str) -> Optional[float]:
+    """
+    Reads the duration straight from an MP4/MOV file's moov/mvhd box: a few header reads and seeks,
+    no subprocess. Returns None if the box layout isn't what's expected, so the caller can fall back to ffprobe.
+    """
+    with open(video_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        end = file_size
+        offset = 0
+        in_moov = False
+        while offset + 8 <= end:
+            f.seek(offset)
+            box_size, box_type = struct.unpack('>I4s', f.read(8))
+            header_size = 8
+            if box_size == 1: # 64-bit size follows the type
+                box_size = struct.unpack('>Q', f.read(8))[0]
+                header_size = 16
+            elif box_size == 0: # Box runs to the end of its parent
+                box_size = end - offset
+            if box_size < header_size:
+                return None
+
+            if box_type == b'moov' and not in_moov:
+                # Descend: mvhd is one of moov's direct children
+                in_moov = True
+                end = min(offset + box_size, file_size)
+                offset += header_size
+                continue
+            if box_type == b'mvhd' and in_moov:
+                version = f.read(4)[0] # version byte, then 3 flag bytes
+                if version == 1:
+                    timescale, duration = struct.unpack('>16xIQ', f.read(28))
+                else:
+                    timescale, duration = struct.unpack('>8xII', f.read(16))
+                return duration / timescale if timescale else None
+            offset += box_size
+    return None
+
+@functools.lru_cache(maxsize=512)
+def _mp4_duration_cached(video_path: str, mtime_ns: int, size: int) -> Optional[float]:
+    """_read_mp4_duration memoized per (path, mtime, size), like _probe_cached."""
+    try:
+        return _read_mp4_duration(video_path)
+    except (OSError, struct.error, IndexError):
+        return None
+
+def get_video_duration(video_path: str) -> Optional[float]:
+    """
+    Gets the duration of a video file in seconds.
+    MP4/MOV files are read from the container header directly; other files, or ones that fail to parse, use ffprobe.
+    Returns None if the duration cannot be determined.
+    """
+    if video_path.lower().endswith(_MP4_EXTENSIONS):
+        try:
+            st = os.stat(video_path)
+        except OSError:
+            st = None
+        if st is not None:
+            duration = _mp4_duration_cached(video_path, st.st_mtime_ns, st.st_size)
+            if duration:
+                return duration
+
+    probe = probe_video(video_path)
+    if probe is None:
+        logger.warning(f"Could not probe video for duration check: {video_path}")
+        return None
+
+    try:
+        return float(probe['format']['duration'])
+    except (KeyError, TypeError, ValueError):
+        logger.warning(f"Could not parse duration from ffprobe output for {video_path}")
+        return None
+
+def get_video_resolution(video_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Gets the resolution (width, height) of a video file using ffprobe.
+    Returns None if the resolution cannot be determined.
+    """
+    probe = probe_video(video_path)
+    if probe is None:
+        logger.warning(f"Could not probe video for resolution check: {video_path}")
+        return None
+
+    for stream in probe.get('streams', []):
+        if stream.get('codec_type') == 'video':
+            try:
+                return int(stream['width']), int(stream['height'])
+            except (KeyError, TypeError, ValueError):
+                break
+    logger.warning(f"Could not parse resolution from ffprobe output for {video_path}")
+    return None
+
+_ENSURED_DIRS: set = set() # Directories already created by _ensure_dir in this process
+
+def _ensure_dir(directory: str) -> None:
+    """Creates a directory once per process; later calls for the same path skip the makedirs syscalls."""
+    if directory and directory not in _ENSURED_DIRS:
+        os.makedirs(directory, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+
+def reset_ensured_dirs() -> None:
+    """Forgets which directories exist. Call after deleting runtime directories so they get recreated."""
+    _ENSURED_DIRS.clear()
+
+def is_probably_valid_clip(video_path: str, min_bytes: int = 1024) -> bool:
+    """
+    Cheap sanity check for a downloaded clip: the file exists and is at least min_bytes.
+    Use this to validate downloads; only call get_video_duration/get_video_resolution
+    when the metadata is actually needed (those results are cached per file).
+    """
+    try:
+        return os.stat(video_path).st_size >= min_bytes
+    except OSError:
+        return False
+
+def download_video_clip(video_url: str, output_path: str) -> Optional[str]:
+    """
+    Downloads a video clip from a URL.
+    Links produced by the simulated searches are replaced by a generated dummy clip.
+    FIX: Create a more robust dummy video with a simple audio track.
+    """
+    logger.info(f"Attempting to download video clip from {video_url} to {output_path}")
+
+    _ensure_dir(os.path.dirname(output_path))
+
+    try:
+        if not video_url.startswith(_SIMULATED_URL_PREFIX):
+            response = SESSION.get(video_url, stream=True, timeout=_DOWNLOAD_TIMEOUT)
+            response.raise_for_status()
+            response.raw.decode_content = False # MP4 payloads are already compressed; copy bytes as-is
+            expected_size = int(response.headers.get('content-length', 0) or 0)
+            with open(output_path, 'wb', buffering=_DOWNLOAD_BUFFER_SIZE) as f:
+                if expected_size > 0:
+                    # Reserve the whole file up front so the filesystem can allocate one contiguous extent
+                    try:
+                        if hasattr(os, 'posix_fallocate'):
+                            os.posix_fallocate(f.fileno(), 0, expected_size)
+                        else:
+                            f.truncate(expected_size)
+                    except OSError:
+                        pass # e.g. tmpfs or NFS without fallocate support; just grow the file as we write
+                shutil.copyfileobj(response.raw, f, length=_DOWNLOAD_BUFFER_SIZE)
+                f.truncate() # Drop any preallocated tail if the body came up short
+                if hasattr(os, 'posix_fadvise'):
+                    # Hint the kernel to drop the written pages so large downloads don't evict hotter cache
+                    f.flush()
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            if not is_probably_valid_clip(output_path):
+                logger.error(f"Downloaded file from {video_url} is missing or too small to be a video: {output_path}")
+                return None
+            logger.info(f"Video download complete: {output_path}")
+            return output_path
+
+        # Placeholder clip: a single write of the pre-encoded bytes, no ffmpeg process
+        with open(output_path, 'wb') as f:
+            f.write(_DUMMY_MP4_BYTES)
+        logger.info(f"Simulated video download complete. Dummy file created at: {output_path}")
+
+        if is_probably_valid_clip(output_path):
+            return output_path
+        else:
+            logger.error(f"Failed to create dummy video file at {output_path}")
+            return None
+    except requests.exceptions.RequestException as req_err:
+        logger.error(f"Network or request error during download of {video_url}: {req_err}")
+        raise # Retries already happened in the session's adapter; let the caller decide
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during download of {video_url}: {e}", exc_info=True)
+        return None
+
+# Search responses are cached in memory and on disk so repeated queries skip the HTTP round trip
+_SEARCH_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'einsteincoder', 'search')
+_SEARCH_CACHE_LOCK = threading.Lock() # shelve is not safe for concurrent access
+
+def _ttl_cache(ttl_seconds: Optional[int] = None, maxsize: int = 256, ignore: Tuple[str, ...] = ('api_key',),
+               service: Optional[str] = None):
+    """
+    Memoizes a keyword-only function for ttl_seconds (default: cache_settings.stock_search_ttl_s, 24h),
+    keeping at most maxsize entries in memory (LRU) and mirroring them to a shelve file under ~/.cache
+    so results survive restarts. Arguments named in `ignore` (e.g. credentials) are left out of the cache key.
+    When `service` is given, real calls are recorded with cost_analyzer as 'requests' and hits as 'cache_hits'.
+    """
+    if ttl_seconds is None:
+        ttl_seconds = GLOBAL_CONFIG.get('cache_settings', {}).get('stock_search_ttl_s', 24 * 3600)
+
+    def decorator(func):
+        memo: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            key = repr((func.__name__, sorted((k, v) for k, v in kwargs.items() if k not in ignore)))
+            now = time.time()
+            with _SEARCH_CACHE_LOCK:
+                entry = memo.get(key)
+                if entry is None:
+                    try:
+                        _ensure_dir(os.path.dirname(_SEARCH_CACHE_PATH))
+                        with shelve.open(_SEARCH_CACHE_PATH) as disk_cache:
+                            entry = disk_cache.get(key)
+                    except Exception as e:
+                        logger.warning(f"Could not read search cache at {_SEARCH_CACHE_PATH}: {e}")
+                if entry is not None and entry[1] > now:
+                    memo[key] = entry
+                    memo.move_to_end(key)
+                    logger.info(f"Using cached {func.__name__} result ({int(entry[1] - now)}s left).")
+                    if service:
+                        cost_analyzer.record_usage(service, 'cache_hits', 1)
+                    return entry[0]
+
+            value = func(**kwargs)
+            if service:
+                cost_analyzer.record_usage(service, 'requests', 1)
+            entry = (value, now + ttl_seconds)
+            with _SEARCH_CACHE_LOCK:
+                memo[key] = entry
+                memo.move_to_end(key)
+                while len(memo) > maxsize:
+                    memo.popitem(last=False)
+                try:
+                    with shelve.open(_SEARCH_CACHE_PATH) as disk_cache:
+                        disk_cache[key] = entry
+                except Exception as e:
+                    logger.warning(f"Could not write search cache at {_SEARCH_CACHE_PATH}: {e}")
+            return value
+        return wrapper
+    return decorator
+
+@_ttl_cache(service='pexels_video_search')
+def _fetch_pexels_videos(*, query: str, api_key: str, orientation: str, per_page: int) -> List[Dict[str, Any]]:
+    """Performs the real Pexels API request."""
+    with _PEXELS_API_SEMAPHORE:
+        response = SESSION.get(
+            PEXELS_VIDEO_SEARCH_URL,
+            headers={'Authorization': api_key},
+            params={'query': query, 'orientation': orientation, 'per_page': per_page},
+            timeout=_API_TIMEOUT
+        )
+    response.raise_for_status()
+    return response.json().get('videos', [])
+
+@_ttl_cache(service='pixabay_video_search')
+def _fetch_pixabay_videos(*, query: str, api_key: str, editors_choice: bool, per_page: int) -> List[Dict[str, Any]]:
+    """Performs the real Pixabay API request."""
+    with _PIXABAY_API_SEMAPHORE:
+        response = SESSION.get(
+            PIXABAY_VIDEO_SEARCH_URL,
+            params={'key': api_key, 'q': query, 'editors_choice': str(editors_choice).lower(), 'per_page': max(3, per_page)},
+            timeout=_API_TIMEOUT
+        )
+    response.raise_for_status()
+    return response.json().get('hits', [])
+
+_DUMMY_RESULT_COUNT = 3 # Simulated searches return a few dummy results
+
+# Simulated search results are identical on every call, so they are built once at import
+_PEXELS_DUMMY_TEMPLATE = tuple({
+    "id": f"pexels_dummy_{i}",
+    "url": f"https://www.pexels.com/video/dummy-video-{i}/",
+    "image": "https://images.pexels.com/videos/pixels-dummy.jpeg",
+    "duration": 15 + i*5, # Dummy duration
+    "video_files": [
+        {"link": f"{_SIMULATED_URL_PREFIX}dummy_pexels_video_{i}.mp4", "quality": "hd", "width": 1080, "height": 1920, "fps": 30},
+        {"link": f"{_SIMULATED_URL_PREFIX}dummy_pexels_video_sd_{i}.mp4", "quality": "sd", "width": 720, "height": 1280, "fps": 30}
+    ]
+} for i in range(_DUMMY_RESULT_COUNT))
+
+_PIXABAY_DUMMY_TEMPLATE = tuple({
+    "id": f"pixabay_dummy_{i}",
+    "pageURL": f"https://pixabay.com/videos/dummy-video-{i}/",
+    "picture_id": f"dummy_{i}",
+    "duration": 20 + i*3, # Dummy duration
+    "videos": {
+        size: {"url": f"{_SIMULATED_URL_PREFIX}dummy_pixabay_{size}_video_{i}.mp4"}
+        for size in ("tiny", "small", "medium", "large")
+    }
+} for i in range(_DUMMY_RESULT_COUNT))
+
+def search_pexels_videos(query: str, api_key: str, orientation: str = 'portrait', per_page: int = 10) -> List[Dict[str, Any]]:
+    """
+    Searches for videos on Pexels.
+    Falls back to simulated results when no Pexels API key is configured.
+    """
+    if api_key and api_key != 'YOUR_PEXELS_API_KEY_PLACEHOLDER':
+        logger.info(f"Searching Pexels videos for '{query}', orientation: '{orientation}'")
+        try:
+            videos = _fetch_pexels_videos(query=query, api_key=api_key, orientation=orientation, per_page=per_page)
+        except requests.exceptions.RequestException as req_err:
+            logger.error(f"Pexels video search failed for '{query}': {req_err}")
+            raise
+        logger.info(f"Pexels search returned {len(videos)} results.")
+        return videos
+
+    logger.info(f"Simulating Pexels video search for '{query}', orientation: '{orientation}'")
+    # Copy the containers callers may reorder or extend, so the shared template stays intact
+    dummy_videos = [dict(v, video_files=list(v["video_files"])) for v in _PEXELS_DUMMY_TEMPLATE[:per_page]]
+    logger.info(f"Simulated Pexels search returned {len(dummy_videos)} results.")
+    return dummy_videos
+
+def search_pixabay_videos(query: str, api_key: str, editors_choice: bool = True, per_page: int = 10) -> List[Dict[str, Any]]:
+    """
+    Searches for videos on Pixabay.
+    Falls back to simulated results when no Pixabay API key is configured.
+    """
+    if api_key and api_key != 'YOUR_PIXABAY_API_KEY_PLACEHOLDER':
+        logger.info(f"Searching Pixabay videos for '{query}', editors_choice: {editors_choice}")
+        try:
+            videos = _fetch_pixabay_videos(query=query, api_key=api_key, editors_choice=editors_choice, per_page=per_page)
+        except requests.exceptions.RequestException as req_err:
+            logger.error(f"Pixabay video search failed for '{query}': {req_err}")
+            raise
+        logger.info(f"Pixabay search returned {len(videos)} results.")
+        return videos
+
+    logger.info(f"Simulating Pixabay video search for '{query}', editors_choice: {editors_choice}")
+    dummy_videos = [dict(v, videos=dict(v["videos"])) for v in _PIXABAY_DUMMY_TEMPLATE[:per_page]]
+    logger.info(f"Simulated Pixabay search returned {len(dummy_videos)} results.")
+    return dummy_videos
+
+def search_stock_videos(
+    query: str,
+    pexels_api_key: Optional[str] = None,
+    pixabay_api_key: Optional[str] = None,
+    orientation: str = 'portrait',
+    per_page: int = 10
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Runs the Pexels and Pixabay searches concurrently and returns {'pexels': [...], 'pixabay': [...]}.
+    A provider is skipped when its key is None; if one search fails, its list is empty and the other is still returned.
+    """
+    searches = {}
+    if pexels_api_key is not None:
+        searches['pexels'] = (search_pexels_videos, {'query': query, 'api_key': pexels_api_key, 'orientation': orientation, 'per_page': per_page})
+    if pixabay_api_key is not None:
+        searches['pixabay'] = (search_pixabay_videos, {'query': query, 'api_key': pixabay_api_key, 'per_page': per_page})
+
+    results: Dict[str, List[Dict[str, Any]]] = {'pexels': [], 'pixabay': []}
+    if not searches:
+        return results
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(searches)) as executor:
+        futures = {name: executor.submit(func, **kwargs) for name, (func, kwargs) in searches.items()}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.error(f"{name.capitalize()} search failed for '{query}', continuing with the other provider: {e}")
+    return results